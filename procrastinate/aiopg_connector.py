@@ -15,6 +15,18 @@ logger = logging.getLogger(__name__)
 
 LISTEN_TIMEOUT = 30.0
 
+# These queries run for every job: they're prepared once per connection, so that
+# PostgreSQL doesn't parse and plan them again each time
+PREPARED_QUERIES = [
+    "defer_job",
+    "defer_jobs",
+    "fetch_job",
+    "fetch_jobs",
+    "finish_job",
+    "finish_jobs",
+]
+PREPARED_QUERY_NAMES = {sql.queries[name]: name for name in PREPARED_QUERIES}
+
 CoroutineFunction = Callable[..., Coroutine]
 
 
@@ -39,6 +51,48 @@ def wrap_exceptions(coro: CoroutineFunction) -> CoroutineFunction:
     return wrapped
 
 
+def get_statement_name(query_name: str) -> str:
+    return f"procrastinate_{query_name}"
+
+
+def make_prepare_query(query_name: str) -> psycopg2.sql.Composed:
+    query, _ = sql.convert_query(sql.queries[query_name])
+    return psycopg2.sql.SQL(sql.queries["prepare_statement"]).format(
+        statement_name=psycopg2.sql.Identifier(get_statement_name(query_name)),
+        query=psycopg2.sql.SQL(query),
+    )
+
+
+def make_execute_query(
+    query_name: str, parameter_types: List[str]
+) -> psycopg2.sql.Composed:
+    # Arguments are cast to the type of the parameters, as arrays wouldn't be
+    # coerced to them otherwise
+    _, argument_names = sql.convert_query(sql.queries[query_name])
+    return psycopg2.sql.SQL(sql.queries["execute_statement"]).format(
+        statement_name=psycopg2.sql.Identifier(get_statement_name(query_name)),
+        arguments=psycopg2.sql.SQL(", ").join(
+            psycopg2.sql.SQL(f"%({name})s::{type}")
+            for name, type in zip(argument_names, parameter_types)
+        ),
+    )
+
+
+async def prepare_statements(connection: aiopg.Connection) -> None:
+    async with connection.cursor() as cursor:
+        for query_name in PREPARED_QUERIES:
+            try:
+                await cursor.execute(make_prepare_query(query_name))
+            except psycopg2.Error:
+                # e.g. the schema is not applied yet. The statement will be
+                # prepared when it's first used.
+                logger.debug(
+                    f"Could not prepare {query_name}",
+                    extra={"action": "prepare_statement_error"},
+                    exc_info=True,
+                )
+
+
 @utils.add_sync_api
 class AiopgConnector(connector.BaseConnector):
     def __init__(
@@ -100,6 +154,9 @@ class AiopgConnector(connector.BaseConnector):
         self.json_loads = json_loads
         self._pool_args = self._adapt_pool_args(kwargs, json_loads)
         self._lock = asyncio.Lock()
+        # The parameter types of prepared statements don't depend on the
+        # connection: the EXECUTE queries are shared by all of them
+        self._execute_queries: Dict[str, psycopg2.sql.Composed] = {}
 
     @staticmethod
     def _adapt_pool_args(
@@ -116,6 +173,7 @@ class AiopgConnector(connector.BaseConnector):
                 await base_on_connect(connection)
             if json_loads:
                 psycopg2.extras.register_default_jsonb(connection.raw, loads=json_loads)
+            await prepare_statements(connection)
 
         final_args = {
             "dsn": "",
@@ -142,12 +200,15 @@ class AiopgConnector(connector.BaseConnector):
             self._pool = None
 
     def _wrap_json(self, arguments: Dict[str, Any]):
-        return {
-            key: Json(value, dumps=self.json_dumps)
-            if isinstance(value, dict)
-            else value
-            for key, value in arguments.items()
-        }
+        return {key: self._wrap_json_value(value) for key, value in arguments.items()}
+
+    def _wrap_json_value(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            return Json(value, dumps=self.json_dumps)
+        # Lists are sent as arrays, possibly of JSON values
+        if isinstance(value, list):
+            return [self._wrap_json_value(item) for item in value]
+        return value
 
     @staticmethod
     @wrap_exceptions
@@ -176,24 +237,59 @@ class AiopgConnector(connector.BaseConnector):
     # Because of this, it's easier to have 2 distinct methods for executing from
     # a pool or from a connection
 
+    async def _get_execute_query(
+        self, cursor: aiopg.Cursor, query_name: str
+    ) -> psycopg2.sql.Composed:
+        if query_name not in self._execute_queries:
+            statement_name = get_statement_name(query_name)
+            await cursor.execute(
+                sql.queries["prepared_statement_types"],
+                {"statement_name": statement_name},
+            )
+            row = await cursor.fetchone()
+            if row is None:
+                await cursor.execute(make_prepare_query(query_name))
+                return await self._get_execute_query(cursor, query_name)
+            self._execute_queries[query_name] = make_execute_query(
+                query_name, row["types"]
+            )
+        return self._execute_queries[query_name]
+
+    async def _execute(
+        self, cursor: aiopg.Cursor, query: str, arguments: Dict[str, Any]
+    ) -> None:
+        query_name = PREPARED_QUERY_NAMES.get(query)
+        if query_name is None:
+            await cursor.execute(query, self._wrap_json(arguments))
+            return
+
+        execute_query = await self._get_execute_query(cursor, query_name)
+        try:
+            await cursor.execute(execute_query, self._wrap_json(arguments))
+        except psycopg2.errors.InvalidSqlStatementName:
+            # The connection was not prepared (e.g. the pool was created outside
+            # of the connector)
+            await cursor.execute(make_prepare_query(query_name))
+            await cursor.execute(execute_query, self._wrap_json(arguments))
+
     @wrap_exceptions
     async def execute_query(self, query: str, **arguments: Any) -> None:
         pool = await self._get_pool()
         with await pool.cursor() as cursor:
-            await cursor.execute(query, self._wrap_json(arguments))
+            await self._execute(cursor, query, arguments)
 
     @wrap_exceptions
     async def _execute_query_connection(
         self, query: str, connection: aiopg.Connection, **arguments: Any,
     ) -> None:
         async with connection.cursor() as cursor:
-            await cursor.execute(query, self._wrap_json(arguments))
+            await self._execute(cursor, query, arguments)
 
     @wrap_exceptions
     async def execute_query_one(self, query: str, **arguments: Any) -> Dict[str, Any]:
         pool = await self._get_pool()
         with await pool.cursor() as cursor:
-            await cursor.execute(query, self._wrap_json(arguments))
+            await self._execute(cursor, query, arguments)
 
             return await cursor.fetchone()
 
@@ -203,7 +299,7 @@ class AiopgConnector(connector.BaseConnector):
     ) -> List[Dict[str, Any]]:
         pool = await self._get_pool()
         with await pool.cursor() as cursor:
-            await cursor.execute(query, self._wrap_json(arguments))
+            await self._execute(cursor, query, arguments)
 
             return await cursor.fetchall()
 
@@ -255,4 +351,9 @@ class AiopgConnector(connector.BaseConnector):
             except asyncio.TimeoutError:
                 continue
 
+            # Notifications that arrived in the meantime would only set the
+            # event again: consume them all at once.
+            while not connection.notifies.empty():
+                connection.notifies.get_nowait()
+
             event.set()
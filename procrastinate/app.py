@@ -56,6 +56,8 @@ class App:
         connector: connector_module.BaseConnector,
         import_paths: Optional[Iterable[str]] = None,
         worker_defaults: Optional[Dict] = None,
+        log_events: bool = True,
+        queues_log_events: Optional[Dict[str, bool]] = None,
     ):
         """
         Parameters
@@ -78,6 +80,13 @@ class App:
         worker_defaults :
             All the values passed here will override the default values sent when
             launching a worker. See `App.run_worker` for details.
+        log_events :
+            If ``False``, the jobs deferred by this app don't record their events in
+            the ``procrastinate_events`` table. Their main dates are still available
+            in the ``procrastinate_jobs`` table. Defaults to ``True``.
+        queues_log_events :
+            Mapping of queue names to whether the jobs deferred in this queue record
+            their events, overriding ``log_events`` for these queues.
         """
         self.connector = connector
         self.tasks: Dict[str, "tasks.Task"] = {}
@@ -86,7 +95,11 @@ class App:
         self.import_paths = import_paths or []
         self.worker_defaults = worker_defaults or {}
 
-        self.job_store = store.JobStore(connector=self.connector)
+        self.job_store = store.JobStore(
+            connector=self.connector,
+            log_events=log_events,
+            queues_log_events=queues_log_events,
+        )
 
         self._register_builtin_tasks()
 
@@ -194,7 +207,8 @@ class App:
         Returns
         -------
         ``jobs.JobDeferrer``
-            Launch ``.defer(**task_kwargs)`` on this object to defer your job.
+            Launch ``.defer(**task_kwargs)`` on this object to defer your job, or
+            ``.batch_defer(*task_kwargs)`` to defer several jobs at once.
         """
         from procrastinate import tasks
 
@@ -250,6 +264,15 @@ class App:
             Raising this parameter can lower the rate of workers making queries to the
             database for requesting jobs.
             (defaults to 5.0)
+        finish_batch_size : ``int``
+            Maximum number of job completions the worker buffers before acknowledging
+            them all at once to the database. Values above 1 lower the number of
+            queries for short jobs, at the cost of releasing job locks slightly later
+            (defaults to ``1``, which acknowledges each job immediately).
+        finish_batch_delay : ``float``
+            Maximum duration (in seconds) a job completion stays in the buffer
+            before being acknowledged. Only used if ``finish_batch_size`` is above 1
+            (defaults to 0.01).
         """
         self.perform_import_paths()
         worker = self._worker(**kwargs)
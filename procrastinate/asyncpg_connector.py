@@ -0,0 +1,219 @@
+import asyncio
+import functools
+import json
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterable,
+    List,
+    NoReturn,
+    Optional,
+    Tuple,
+)
+
+import asyncpg
+
+from procrastinate import connector, exceptions, sql, utils
+
+CoroutineFunction = Callable[..., Coroutine]
+
+
+def wrap_exceptions(coro: CoroutineFunction) -> CoroutineFunction:
+    """
+    Wrap asyncpg errors as connector exceptions
+    This decorator is expected to be used on coroutine functions only
+    """
+
+    @functools.wraps(coro)
+    async def wrapped(*args, **kwargs):
+        try:
+            return await coro(*args, **kwargs)
+        except asyncpg.exceptions.UniqueViolationError as exc:
+            raise exceptions.UniqueViolation(constraint_name=exc.constraint_name)
+        except (asyncpg.PostgresError, asyncpg.InterfaceError) as exc:
+            raise exceptions.ConnectorException from exc
+
+    # Attaching a custom attribute to ease testability and make the
+    # decorator more introspectable
+    wrapped._exceptions_wrapped = True  # type: ignore
+    return wrapped
+
+
+@utils.add_sync_api
+class AsyncpgConnector(connector.BaseConnector):
+    def __init__(
+        self,
+        *,
+        json_dumps: Optional[Callable] = None,
+        json_loads: Optional[Callable] = None,
+        **kwargs: Any,
+    ):
+        """
+        Create a PostgreSQL connector using asyncpg. The connector uses an
+        ``asyncpg.Pool``, which is either created automatically upon first use, or set
+        through the `AsyncpgConnector.set_pool` method.
+
+        Queries are sent as prepared statements, which asyncpg caches on each
+        connection, and use the binary protocol. Job arguments are encoded and decoded
+        by asyncpg codecs, right when they're sent to and read from the database.
+
+        All other arguments than ``json_dumps`` and ``json_loads`` are passed to
+        :py:func:`asyncpg.create_pool` (see asyncpg documentation__), with default
+        values that may differ from those of ``asyncpg`` (see the list of parameters
+        below).
+
+        .. __: https://magicstack.github.io/asyncpg/current/api/
+            index.html#connection-pools
+
+        Parameters
+        ----------
+        json_dumps :
+            The JSON dumps function to use for serializing job arguments. Defaults to
+            ``json.dumps``.
+        json_loads :
+            The JSON loads function to use for deserializing job arguments. Defaults
+            to ``json.loads``. Unused if the pool is externally created and set into the
+            connector through the `AsyncpgConnector.set_pool` method.
+        max_size : ``int``
+            Passed to asyncpg. Cannot be lower than 2, otherwise worker won't be
+            functioning normally (one connection for listen/notify, one for executing
+            tasks).
+        """
+        self._pool: Optional[asyncpg.pool.Pool] = None
+        self.json_dumps = json_dumps
+        self.json_loads = json_loads
+        self._pool_args = self._adapt_pool_args(kwargs, json_dumps, json_loads)
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _adapt_pool_args(
+        pool_args: Dict[str, Any],
+        json_dumps: Optional[Callable],
+        json_loads: Optional[Callable],
+    ) -> Dict[str, Any]:
+        """
+        Adapt the pool args for ``asyncpg``, using sensible defaults for Procrastinate.
+        """
+        base_init = pool_args.pop("init", None)
+        dumps = json_dumps or json.dumps
+        loads = json_loads or json.loads
+
+        async def init(connection):
+            # The binary format of jsonb is its text format, prefixed with a version
+            await connection.set_type_codec(
+                "jsonb",
+                schema="pg_catalog",
+                encoder=lambda value: b"\x01" + dumps(value).encode(),
+                decoder=lambda value: loads(value[1:]),
+                format="binary",
+            )
+            await connection.set_type_codec(
+                "json",
+                schema="pg_catalog",
+                encoder=lambda value: dumps(value).encode(),
+                decoder=loads,
+                format="binary",
+            )
+            if base_init:
+                await base_init(connection)
+
+        final_args = {"init": init}
+        if "max_size" in pool_args:
+            pool_args["max_size"] = max(2, pool_args["max_size"])
+
+        final_args.update(pool_args)
+        return final_args
+
+    @wrap_exceptions
+    async def close_async(self) -> None:
+        """
+        Close the pool and awaits all connections to be released.
+        """
+        if self._pool:
+            await self._pool.close()
+            self._pool = None
+
+    @staticmethod
+    @wrap_exceptions
+    async def _create_pool(pool_args: Dict[str, Any]) -> asyncpg.pool.Pool:
+        return await asyncpg.create_pool(**pool_args)
+
+    def set_pool(self, pool: asyncpg.pool.Pool) -> None:
+        """
+        Set the connection pool. Raises an exception if the pool is already set.
+        """
+        if self._pool:
+            raise exceptions.PoolAlreadySet
+        self._pool = pool
+
+    async def _get_pool(self) -> asyncpg.pool.Pool:
+        if self._pool:
+            return self._pool
+        async with self._lock:
+            if not self._pool:
+                self.set_pool(await self._create_pool(self._pool_args))
+        return self._pool
+
+    @staticmethod
+    def _prepare_query(query: str, arguments: Dict[str, Any]) -> Tuple[str, List]:
+        query, names = sql.convert_query(query)
+        return query, [arguments[name] for name in names]
+
+    @wrap_exceptions
+    async def execute_query(self, query: str, **arguments: Any) -> None:
+        pool = await self._get_pool()
+        query, args = self._prepare_query(query, arguments)
+        # Without arguments, the simple query protocol is used, which allows
+        # executing several statements at once (e.g. the schema)
+        await pool.execute(query, *args)
+
+    @wrap_exceptions
+    async def execute_query_one(self, query: str, **arguments: Any) -> Dict[str, Any]:
+        pool = await self._get_pool()
+        query, args = self._prepare_query(query, arguments)
+        row = await pool.fetchrow(query, *args)
+        # Like with aiopg, None is returned when the query doesn't return any row
+        return row and dict(row)
+
+    @wrap_exceptions
+    async def execute_query_all(
+        self, query: str, **arguments: Any
+    ) -> List[Dict[str, Any]]:
+        pool = await self._get_pool()
+        query, args = self._prepare_query(query, arguments)
+        return [dict(row) for row in await pool.fetch(query, *args)]
+
+    @wrap_exceptions
+    async def listen_notify(
+        self, event: asyncio.Event, channels: Iterable[str]
+    ) -> NoReturn:
+        pool = await self._get_pool()
+        channels = list(channels)
+
+        def notify(*args):
+            event.set()
+
+        # We need to acquire a dedicated connection, and listen on it until
+        # it's closed
+        while True:
+            async with pool.acquire() as connection:
+                closed = asyncio.Event()
+
+                def on_close(connection):
+                    closed.set()
+
+                connection.add_termination_listener(on_close)
+                try:
+                    for channel_name in channels:
+                        await connection.add_listener(channel_name, notify)
+                    # Initial set() lets caller know that we're ready to listen
+                    event.set()
+                    await closed.wait()
+                finally:
+                    # A closed connection has already forgotten its listeners
+                    if not closed.is_set():
+                        connection.remove_termination_listener(on_close)
+                        for channel_name in channels:
+                            await connection.remove_listener(channel_name, notify)
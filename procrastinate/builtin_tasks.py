@@ -24,8 +24,20 @@ async def remove_old_jobs(
     remove_error :
         By default only successful jobs will be removed. When this parameter is True
         failed jobs will also be deleted.
+
+    When the schema is partitioned and no queue is specified, whole partitions of
+    jobs and events are dropped instead of deleting jobs one by one: the jobs are
+    removed once the partition of the period they finished in is older than
+    ``max_hours``, and all the events older than that are removed, whatever their
+    job.
     """
     assert context.app
+    if queue is None and await context.app.schema_manager.is_partitioned_async():
+        await context.app.job_store.drop_old_partitions(
+            nb_hours=max_hours, include_error=remove_error
+        )
+        return
+
     await context.app.job_store.delete_old_jobs(
         nb_hours=max_hours, queue=queue, include_error=remove_error
     )
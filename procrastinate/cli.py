@@ -9,7 +9,9 @@ import click
 import pendulum
 
 import procrastinate
-from procrastinate import connector, exceptions, jobs, shell, types, utils, worker
+from procrastinate import connector, exceptions, jobs
+from procrastinate import schema as schema_module
+from procrastinate import shell, types, utils, worker
 
 logger = logging.getLogger(__name__)
 
@@ -129,6 +131,18 @@ def close_connection(procrastinate_app: procrastinate.App, *args, **kwargs):
     default=worker.WORKER_TIMEOUT,
     help="How long to wait for database event push before polling",
 )
+@click.option(
+    "--finish-batch-size",
+    type=int,
+    default=worker.WORKER_FINISH_BATCH_SIZE,
+    help="Number of job completions to buffer before acknowledging them at once",
+)
+@click.option(
+    "--finish-batch-delay",
+    type=float,
+    default=worker.WORKER_FINISH_BATCH_DELAY,
+    help="How long a job completion may be buffered before being acknowledged",
+)
 @click.option(
     "-w",
     "--wait/--one-shot",
@@ -310,8 +324,14 @@ def configure_job(
     flag_value="migrations-path",
     help="Output the path to the directory containing the migration scripts",
 )
+@click.option(
+    "--partition-period",
+    type=click.Choice(schema_module.PARTITION_PERIODS),
+    help="Use the partitioned schema, with a partition per day or per week "
+    "(see the remove_old_jobs task)",
+)
 @handle_errors()
-def schema(app: procrastinate.App, action: str):
+def schema(app: procrastinate.App, action: str, partition_period: Optional[str]):
     """
     Apply SQL schema to the empty database. This won't work if the schema has already
     been applied.
@@ -319,10 +339,12 @@ def schema(app: procrastinate.App, action: str):
     schema_manager = app.schema_manager
     if action == "apply":
         click.echo("Applying schema")
-        schema_manager.apply_schema()  # type: ignore
+        schema_manager.apply_schema(partition_period=partition_period)  # type: ignore
         click.echo("Done")
     elif action == "read":
-        click.echo(schema_manager.get_schema(), nl=False)
+        click.echo(
+            schema_manager.get_schema(partition_period=partition_period), nl=False
+        )
     else:
         click.echo(schema_manager.get_migrations_path())
 
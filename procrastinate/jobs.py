@@ -1,8 +1,9 @@
 import datetime
 import functools
 import logging
+import uuid
 from enum import Enum
-from typing import TYPE_CHECKING, Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 import attr
 
@@ -61,7 +62,7 @@ class Job:
 
     id: Optional[int] = None
     queue: str
-    lock: str
+    lock: Optional[str]
     queueing_lock: Optional[str]
     task_name: str
     task_kwargs: types.JSONDict = attr.ib(factory=dict)
@@ -116,7 +117,10 @@ class JobDeferrer:
         final_kwargs = self.job.task_kwargs.copy()
         final_kwargs.update(task_kwargs)
 
-        return attr.evolve(self.job, task_kwargs=final_kwargs)
+        # Without an explicit lock, each job gets its own
+        lock = self.job.lock or str(uuid.uuid4())
+
+        return attr.evolve(self.job, task_kwargs=final_kwargs, lock=lock)
 
     async def defer_async(self, **task_kwargs: types.JSONValue) -> int:
         """
@@ -137,3 +141,33 @@ class JobDeferrer:
             extra={"action": "job_defer", "job": context},
         )
         return id
+
+    async def batch_defer_async(
+        self, *task_kwargs: types.JSONDict
+    ) -> List[Optional[int]]:
+        """
+        See `Task.batch_defer` for details.
+        """
+        jobs = [self.make_new_job(**kwargs) for kwargs in task_kwargs]
+
+        logger.debug(
+            f"About to defer {len(jobs)} jobs for task {self.job.task_name}",
+            extra={"action": "about_to_defer_jobs", "job": self.job.log_context()},
+        )
+        ids = await self.job_store.defer_jobs(jobs)
+
+        for job, id in zip(jobs, ids):
+            if id is None:
+                logger.debug(
+                    f"Job {job.call_string} cannot be enqueued: there is already "
+                    f"a job in the queue with the lock {job.queueing_lock}",
+                    extra={"action": "job_already_enqueued", "job": job.log_context()},
+                )
+
+        nb_skipped = ids.count(None)
+        logger.info(
+            f"Deferred {len(jobs) - nb_skipped} jobs for task {self.job.task_name} "
+            f"({nb_skipped} already enqueued)",
+            extra={"action": "jobs_defer", "ids": ids},
+        )
+        return ids
@@ -1,12 +1,16 @@
 import pathlib
+from typing import Optional
 
 from importlib_resources import read_text
 
 from procrastinate import connector as connector_module
-from procrastinate import utils
+from procrastinate import sql, utils
 
 migrations_path = pathlib.Path(__file__).parent / "sql" / "migrations"
 
+# Periods covered by each partition, when using the partitioned schema
+PARTITION_PERIODS = ("day", "week")
+
 
 @utils.add_sync_api
 class SchemaManager:
@@ -15,13 +19,32 @@ class SchemaManager:
         self.connector = connector
 
     @staticmethod
-    def get_schema() -> str:
-        return read_text("procrastinate.sql", "schema.sql")
+    def get_schema(partition_period: Optional[str] = None) -> str:
+        schema = read_text("procrastinate.sql", "schema.sql")
+        if partition_period is None:
+            return schema
+
+        if partition_period not in PARTITION_PERIODS:
+            raise ValueError(
+                f"Invalid partition period {partition_period!r}, "
+                f"expected one of {', '.join(PARTITION_PERIODS)}"
+            )
+        partitioning = read_text("procrastinate.sql", "partitioning.sql")
+        return (
+            f"{schema}\n{partitioning}\n"
+            f"SELECT procrastinate_setup_partitioning('{partition_period}');\n"
+        )
 
     @staticmethod
     def get_migrations_path() -> str:
         return str(migrations_path)
 
-    async def apply_schema_async(self) -> None:
-        queries = self.get_schema()
+    async def apply_schema_async(self, partition_period: Optional[str] = None) -> None:
+        queries = self.get_schema(partition_period=partition_period)
         await self.connector.execute_query(query=queries)
+
+    async def is_partitioned_async(self) -> bool:
+        result = await self.connector.execute_query_one(
+            query=sql.queries["is_partitioned"]
+        )
+        return result["partitioned"]
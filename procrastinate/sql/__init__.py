@@ -1,9 +1,12 @@
+import functools
 import re
-from typing import Dict
+from typing import Dict, List, Tuple
 
 from importlib_resources import read_text
 
 QUERIES_REGEX = re.compile(r"(?:\n|^)-- ([a-z0-9_]+) --\n(?:-- .+\n)*", re.MULTILINE)
+# Queries use the psycopg2 "pyformat" placeholders
+PLACEHOLDER_REGEX = re.compile(r"%\((\w+)\)s|%%")
 
 
 def parse_query_file(query_file: str) -> Dict["str", "str"]:
@@ -24,4 +27,24 @@ def get_queries() -> Dict["str", "str"]:
     return parse_query_file(read_text("procrastinate.sql", "queries.sql"))
 
 
+@functools.lru_cache(maxsize=None)
+def convert_query(query: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Convert a query using ``%(name)s`` placeholders to the ``$1`` placeholders of
+    server-side prepared statements. Returns the converted query and the names of the
+    arguments, in the order of their placeholders.
+    """
+    names: List[str] = []
+
+    def replace(match):
+        name = match.group(1)
+        if name is None:
+            return "%"
+        if name not in names:
+            names.append(name)
+        return f"${names.index(name) + 1}"
+
+    return PLACEHOLDER_REGEX.sub(replace, query), tuple(names)
+
+
 queries = get_queries()
@@ -0,0 +1,33 @@
+-- add a procrastinate_fetch_jobs function, claiming several jobs in a single query
+CREATE FUNCTION procrastinate_fetch_jobs(target_queue_names character varying[], nb_jobs integer) RETURNS SETOF procrastinate_jobs
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+	RETURN QUERY
+	WITH candidate_jobs AS (
+		SELECT procrastinate_jobs.*
+			FROM procrastinate_jobs
+			LEFT JOIN procrastinate_job_locks ON procrastinate_job_locks.object = procrastinate_jobs.lock
+			WHERE (target_queue_names IS NULL OR queue_name = ANY( target_queue_names ))
+			  AND procrastinate_job_locks.object IS NULL
+			  AND status = 'todo'
+			  AND (scheduled_at IS NULL OR scheduled_at <= now())
+			ORDER BY id ASC
+			FOR UPDATE OF procrastinate_jobs SKIP LOCKED LIMIT nb_jobs
+	), potential_jobs AS (
+		-- jobs sharing a lock cannot run together: only keep the oldest one
+		SELECT DISTINCT ON (lock) * FROM candidate_jobs ORDER BY lock, id
+	), lock_objects AS (
+		INSERT INTO procrastinate_job_locks
+			SELECT lock FROM potential_jobs
+			ON CONFLICT DO NOTHING
+			RETURNING object
+	)
+	UPDATE procrastinate_jobs
+		SET status = 'doing'
+		FROM potential_jobs
+		JOIN lock_objects ON lock_objects.object = potential_jobs.lock
+		WHERE procrastinate_jobs.id = potential_jobs.id
+		RETURNING procrastinate_jobs.*;
+END;
+$$;
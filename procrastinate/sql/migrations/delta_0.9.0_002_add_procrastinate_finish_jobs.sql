@@ -0,0 +1,17 @@
+-- add a procrastinate_finish_jobs function, finishing several jobs in a single query
+CREATE FUNCTION procrastinate_finish_jobs(job_ids bigint[], end_statuses procrastinate_job_status[], next_scheduled_ats timestamp with time zone[]) RETURNS void
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+	WITH finished_jobs AS (
+		UPDATE procrastinate_jobs
+		SET status = finished.end_status,
+			attempts = attempts + 1,
+			scheduled_at = COALESCE(finished.next_scheduled_at, scheduled_at)
+		FROM unnest(job_ids, end_statuses, next_scheduled_ats)
+			AS finished(job_id, end_status, next_scheduled_at)
+		WHERE id = finished.job_id RETURNING lock
+	)
+	DELETE FROM procrastinate_job_locks WHERE object IN (SELECT lock FROM finished_jobs);
+END;
+$$;
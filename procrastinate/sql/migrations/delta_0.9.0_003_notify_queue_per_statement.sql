@@ -0,0 +1,26 @@
+-- notify once per queue and per statement instead of once per inserted job
+DROP TRIGGER procrastinate_jobs_notify_queue ON procrastinate_jobs;
+DROP FUNCTION procrastinate_notify_queue();
+
+CREATE FUNCTION procrastinate_notify_queue() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+	target_queue_name character varying;
+BEGIN
+	FOR target_queue_name IN
+		SELECT DISTINCT queue_name FROM new_jobs
+		WHERE status = 'todo'::procrastinate_job_status
+	LOOP
+		PERFORM pg_notify('procrastinate_queue#' || target_queue_name, target_queue_name);
+		PERFORM pg_notify('procrastinate_any_queue', target_queue_name);
+	END LOOP;
+	RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER procrastinate_jobs_notify_queue
+    AFTER INSERT ON procrastinate_jobs
+    REFERENCING NEW TABLE AS new_jobs
+    FOR EACH STATEMENT
+    EXECUTE PROCEDURE procrastinate_notify_queue();
@@ -0,0 +1,4 @@
+-- index only the jobs that can be fetched, so that finished jobs don't slow down fetching
+CREATE INDEX procrastinate_jobs_id_todo_idx ON procrastinate_jobs (id) WHERE status = 'todo';
+CREATE INDEX procrastinate_jobs_queue_name_id_todo_idx ON procrastinate_jobs (queue_name, id) WHERE status = 'todo';
+CREATE INDEX procrastinate_jobs_queue_name_scheduled_at_todo_idx ON procrastinate_jobs (queue_name, scheduled_at) WHERE status = 'todo' AND scheduled_at IS NOT NULL;
@@ -0,0 +1,6 @@
+-- get the events of a job of a given type, and the latest one, from the index only
+CREATE INDEX procrastinate_events_job_id_type_at_idx ON procrastinate_events(job_id, type, at);
+-- the new index covers the foreign key as well
+DROP INDEX procrastinate_events_job_id_fkey;
+-- find running jobs without scanning the finished ones
+CREATE INDEX procrastinate_jobs_id_doing_idx ON procrastinate_jobs (id) WHERE status = 'doing';
@@ -0,0 +1,50 @@
+-- record when jobs finish
+ALTER TABLE procrastinate_jobs ADD COLUMN finished_at timestamp with time zone NULL;
+
+UPDATE procrastinate_jobs
+    SET finished_at = (
+        SELECT max(at) FROM procrastinate_events
+        WHERE procrastinate_events.job_id = procrastinate_jobs.id
+          AND procrastinate_events.type IN ('succeeded', 'failed', 'cancelled')
+    )
+    WHERE status IN ('succeeded', 'failed');
+
+CREATE OR REPLACE FUNCTION procrastinate_finish_job(job_id integer, end_status procrastinate_job_status, next_scheduled_at timestamp with time zone) RETURNS void
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+	WITH finished_job AS (
+		UPDATE procrastinate_jobs
+        SET status = end_status,
+            attempts = attempts + 1,
+            scheduled_at = COALESCE(next_scheduled_at, scheduled_at),
+            finished_at = CASE
+                WHEN end_status IN ('succeeded', 'failed') THEN now()
+                ELSE NULL
+            END
+        WHERE id = job_id RETURNING lock
+	)
+	DELETE FROM procrastinate_job_locks WHERE object = (SELECT lock FROM finished_job);
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION procrastinate_finish_jobs(job_ids bigint[], end_statuses procrastinate_job_status[], next_scheduled_ats timestamp with time zone[]) RETURNS void
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+	WITH finished_jobs AS (
+		UPDATE procrastinate_jobs
+		SET status = finished.end_status,
+			attempts = attempts + 1,
+			scheduled_at = COALESCE(finished.next_scheduled_at, scheduled_at),
+			finished_at = CASE
+				WHEN finished.end_status IN ('succeeded', 'failed') THEN now()
+				ELSE NULL
+			END
+		FROM unnest(job_ids, end_statuses, next_scheduled_ats)
+			AS finished(job_id, end_status, next_scheduled_at)
+		WHERE id = finished.job_id RETURNING lock
+	)
+	DELETE FROM procrastinate_job_locks WHERE object IN (SELECT lock FROM finished_jobs);
+END;
+$$;
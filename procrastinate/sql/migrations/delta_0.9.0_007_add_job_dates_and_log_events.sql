@@ -0,0 +1,105 @@
+-- keep the main dates of the jobs in their rows, and make events optional
+ALTER TABLE procrastinate_jobs
+    ADD COLUMN deferred_at timestamp with time zone NULL,
+    ADD COLUMN started_at timestamp with time zone NULL,
+    ADD COLUMN log_events boolean DEFAULT true NOT NULL;
+
+UPDATE procrastinate_jobs
+    SET deferred_at = (
+            SELECT min(at) FROM procrastinate_events
+            WHERE procrastinate_events.job_id = procrastinate_jobs.id
+              AND procrastinate_events.type = 'deferred'
+        ),
+        started_at = (
+            SELECT max(at) FROM procrastinate_events
+            WHERE procrastinate_events.job_id = procrastinate_jobs.id
+              AND procrastinate_events.type = 'started'
+        );
+
+ALTER TABLE procrastinate_jobs ALTER COLUMN deferred_at SET DEFAULT NOW();
+
+CREATE INDEX procrastinate_jobs_finished_at_idx ON procrastinate_jobs (finished_at) WHERE finished_at IS NOT NULL;
+
+CREATE OR REPLACE FUNCTION procrastinate_fetch_job(target_queue_names character varying[]) RETURNS procrastinate_jobs
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+	found_jobs procrastinate_jobs;
+BEGIN
+	WITH potential_job AS (
+		SELECT procrastinate_jobs.*
+			FROM procrastinate_jobs
+			LEFT JOIN procrastinate_job_locks ON procrastinate_job_locks.object = procrastinate_jobs.lock
+			WHERE (target_queue_names IS NULL OR queue_name = ANY( target_queue_names ))
+			  AND procrastinate_job_locks.object IS NULL
+			  AND status = 'todo'
+			  AND (scheduled_at IS NULL OR scheduled_at <= now())
+            ORDER BY id ASC
+			FOR UPDATE OF procrastinate_jobs SKIP LOCKED LIMIT 1
+	), lock_object AS (
+		INSERT INTO procrastinate_job_locks
+			SELECT lock FROM potential_job
+            ON CONFLICT DO NOTHING
+            RETURNING object
+	)
+	UPDATE procrastinate_jobs
+		SET status = 'doing', started_at = now()
+		FROM potential_job, lock_object
+        WHERE lock_object.object IS NOT NULL
+		AND procrastinate_jobs.id = potential_job.id
+		RETURNING procrastinate_jobs.* INTO found_jobs;
+
+	RETURN found_jobs;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION procrastinate_fetch_jobs(target_queue_names character varying[], nb_jobs integer) RETURNS SETOF procrastinate_jobs
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+	RETURN QUERY
+	WITH candidate_jobs AS (
+		SELECT procrastinate_jobs.*
+			FROM procrastinate_jobs
+			LEFT JOIN procrastinate_job_locks ON procrastinate_job_locks.object = procrastinate_jobs.lock
+			WHERE (target_queue_names IS NULL OR queue_name = ANY( target_queue_names ))
+			  AND procrastinate_job_locks.object IS NULL
+			  AND status = 'todo'
+			  AND (scheduled_at IS NULL OR scheduled_at <= now())
+			ORDER BY id ASC
+			FOR UPDATE OF procrastinate_jobs SKIP LOCKED LIMIT nb_jobs
+	), potential_jobs AS (
+		-- jobs sharing a lock cannot run together: only keep the oldest one
+		SELECT DISTINCT ON (lock) * FROM candidate_jobs ORDER BY lock, id
+	), lock_objects AS (
+		INSERT INTO procrastinate_job_locks
+			SELECT lock FROM potential_jobs
+			ON CONFLICT DO NOTHING
+			RETURNING object
+	)
+	UPDATE procrastinate_jobs
+		SET status = 'doing', started_at = now()
+		FROM potential_jobs
+		JOIN lock_objects ON lock_objects.object = potential_jobs.lock
+		WHERE procrastinate_jobs.id = potential_jobs.id
+		RETURNING procrastinate_jobs.*;
+END;
+$$;
+
+DROP TRIGGER procrastinate_trigger_status_events_update ON procrastinate_jobs;
+CREATE TRIGGER procrastinate_trigger_status_events_update
+    AFTER UPDATE OF status ON procrastinate_jobs
+    FOR EACH ROW WHEN ((new.log_events))
+    EXECUTE PROCEDURE procrastinate_trigger_status_events_procedure_update();
+
+DROP TRIGGER procrastinate_trigger_status_events_insert ON procrastinate_jobs;
+CREATE TRIGGER procrastinate_trigger_status_events_insert
+    AFTER INSERT ON procrastinate_jobs
+    FOR EACH ROW WHEN ((new.status = 'todo'::procrastinate_job_status AND new.log_events))
+    EXECUTE PROCEDURE procrastinate_trigger_status_events_procedure_insert();
+
+DROP TRIGGER procrastinate_trigger_scheduled_events ON procrastinate_jobs;
+CREATE TRIGGER procrastinate_trigger_scheduled_events
+    AFTER UPDATE OR INSERT ON procrastinate_jobs
+    FOR EACH ROW WHEN ((new.scheduled_at IS NOT NULL AND new.status = 'todo'::procrastinate_job_status AND new.log_events))
+    EXECUTE PROCEDURE procrastinate_trigger_scheduled_events_procedure();
@@ -0,0 +1,183 @@
+-- Optional layout where finished jobs and events are stored in time partitions, so that
+-- old jobs can be removed by dropping whole partitions. It is applied right after
+-- schema.sql, on an empty database, by calling procrastinate_setup_partitioning.
+--
+-- * procrastinate_jobs is partitioned by finished_at: the jobs that are not finished
+--   yet live in the procrastinate_jobs_default partition, and finished jobs move to
+--   the partition of the period they finished in. Each of these partitions is split
+--   in two, succeeded jobs on one side and failed jobs on the other.
+-- * procrastinate_events is partitioned by at. Its default partition holds the events
+--   that don't have a partition yet (e.g. jobs scheduled far in the future).
+--
+-- Partitions are created by procrastinate_create_partitions, rows stored in a default
+-- partition while their partition didn't exist are moved to it on creation.
+
+CREATE TABLE procrastinate_partitioning (
+    period text NOT NULL CHECK (period IN ('day', 'week'))
+);
+
+CREATE TABLE procrastinate_partitions (
+    suffix text PRIMARY KEY,
+    period_start timestamp with time zone NOT NULL,
+    period_end timestamp with time zone NOT NULL
+);
+
+CREATE FUNCTION procrastinate_create_partitions(at timestamp with time zone) RETURNS void
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+	partition_period text;
+	partition_start timestamp with time zone;
+	partition_end timestamp with time zone;
+	partition_suffix text;
+	partition_range text;
+BEGIN
+	SELECT period INTO partition_period FROM procrastinate_partitioning;
+	partition_start := date_trunc(partition_period, at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC';
+	partition_end := partition_start + ('1 ' || partition_period)::interval;
+	partition_suffix := to_char(partition_start AT TIME ZONE 'UTC', 'YYYYMMDD');
+	partition_range := ' FOR VALUES FROM (' || quote_literal(partition_start)
+		|| ') TO (' || quote_literal(partition_end) || ')';
+
+	-- Several workers may try to create the same partitions at the same time
+	LOCK TABLE procrastinate_partitions IN EXCLUSIVE MODE;
+	IF EXISTS (SELECT 1 FROM procrastinate_partitions WHERE suffix = partition_suffix) THEN
+		RETURN;
+	END IF;
+
+	CREATE TEMPORARY TABLE procrastinate_moved_jobs ON COMMIT DROP AS
+		SELECT * FROM procrastinate_jobs_default
+		WHERE finished_at >= partition_start AND finished_at < partition_end;
+	DELETE FROM procrastinate_jobs_default
+		WHERE finished_at >= partition_start AND finished_at < partition_end;
+	EXECUTE 'CREATE TABLE ' || quote_ident('procrastinate_jobs_' || partition_suffix)
+		|| ' PARTITION OF procrastinate_jobs' || partition_range
+		|| ' PARTITION BY LIST (status)';
+	EXECUTE 'CREATE TABLE ' || quote_ident('procrastinate_jobs_' || partition_suffix || '_succeeded')
+		|| ' PARTITION OF ' || quote_ident('procrastinate_jobs_' || partition_suffix)
+		|| ' FOR VALUES IN (''succeeded'')';
+	EXECUTE 'CREATE TABLE ' || quote_ident('procrastinate_jobs_' || partition_suffix || '_failed')
+		|| ' PARTITION OF ' || quote_ident('procrastinate_jobs_' || partition_suffix)
+		|| ' DEFAULT';
+	INSERT INTO procrastinate_jobs SELECT * FROM procrastinate_moved_jobs;
+	DROP TABLE procrastinate_moved_jobs;
+
+	CREATE TEMPORARY TABLE procrastinate_moved_events ON COMMIT DROP AS
+		SELECT * FROM procrastinate_events_default
+		WHERE procrastinate_events_default.at >= partition_start
+		  AND procrastinate_events_default.at < partition_end;
+	DELETE FROM procrastinate_events_default
+		WHERE procrastinate_events_default.at >= partition_start
+		  AND procrastinate_events_default.at < partition_end;
+	EXECUTE 'CREATE TABLE ' || quote_ident('procrastinate_events_' || partition_suffix)
+		|| ' PARTITION OF procrastinate_events' || partition_range;
+	INSERT INTO procrastinate_events SELECT * FROM procrastinate_moved_events;
+	DROP TABLE procrastinate_moved_events;
+
+	INSERT INTO procrastinate_partitions (suffix, period_start, period_end)
+		VALUES (partition_suffix, partition_start, partition_end);
+END;
+$$;
+
+CREATE FUNCTION procrastinate_drop_partitions(before timestamp with time zone, include_error boolean) RETURNS void
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+	partition_period text;
+	partition_suffix text;
+BEGIN
+	-- Make sure the jobs finishing from now on have a partition to go to
+	SELECT period INTO partition_period FROM procrastinate_partitioning;
+	PERFORM procrastinate_create_partitions(now());
+	PERFORM procrastinate_create_partitions(now() + ('1 ' || partition_period)::interval);
+
+	FOR partition_suffix IN
+		SELECT suffix FROM procrastinate_partitions WHERE period_end <= before
+	LOOP
+		EXECUTE 'DROP TABLE IF EXISTS '
+			|| quote_ident('procrastinate_jobs_' || partition_suffix || '_succeeded');
+		EXECUTE 'DROP TABLE IF EXISTS '
+			|| quote_ident('procrastinate_events_' || partition_suffix);
+		IF include_error THEN
+			EXECUTE 'DROP TABLE ' || quote_ident('procrastinate_jobs_' || partition_suffix);
+			DELETE FROM procrastinate_partitions WHERE suffix = partition_suffix;
+		END IF;
+	END LOOP;
+END;
+$$;
+
+CREATE FUNCTION procrastinate_setup_partitioning(partition_period text) RETURNS void
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+	partitioned_table text;
+	partition_key text;
+	index_definitions text[];
+	trigger_definitions text[];
+	function_definitions text[];
+	definition text;
+BEGIN
+	INSERT INTO procrastinate_partitioning (period) VALUES (partition_period);
+
+	FOREACH partitioned_table IN ARRAY ARRAY['procrastinate_jobs', 'procrastinate_events']
+	LOOP
+		partition_key := CASE partitioned_table
+			WHEN 'procrastinate_jobs' THEN 'finished_at'
+			ELSE 'at'
+		END;
+
+		-- The indexes and triggers are re-created on the partitioned table
+		SELECT array_agg(pg_get_indexdef(indexrelid)) INTO index_definitions
+			FROM pg_index
+			WHERE indrelid = partitioned_table::regclass AND NOT indisprimary;
+		SELECT array_agg(pg_get_triggerdef(oid)) INTO trigger_definitions
+			FROM pg_trigger
+			WHERE tgrelid = partitioned_table::regclass AND NOT tgisinternal;
+		-- Functions returning rows of the table are dropped along with it
+		SELECT array_agg(pg_get_functiondef(oid)) INTO function_definitions
+			FROM pg_proc
+			WHERE prorettype = partitioned_table::regtype;
+
+		EXECUTE 'CREATE TABLE ' || quote_ident(partitioned_table || '_partitioned')
+			|| ' (LIKE ' || quote_ident(partitioned_table) || ' INCLUDING DEFAULTS)'
+			|| ' PARTITION BY RANGE (' || partition_key || ')';
+		EXECUTE 'ALTER SEQUENCE ' || pg_get_serial_sequence(partitioned_table, 'id')
+			|| ' OWNED BY ' || quote_ident(partitioned_table || '_partitioned') || '.id';
+		-- This also drops the foreign key from procrastinate_events to procrastinate_jobs:
+		-- it cannot reference a partitioned table not including the partition key.
+		EXECUTE 'DROP TABLE ' || quote_ident(partitioned_table) || ' CASCADE';
+		EXECUTE 'ALTER TABLE ' || quote_ident(partitioned_table || '_partitioned')
+			|| ' RENAME TO ' || quote_ident(partitioned_table);
+		EXECUTE 'CREATE TABLE ' || quote_ident(partitioned_table || '_default')
+			|| ' PARTITION OF ' || quote_ident(partitioned_table) || ' DEFAULT';
+
+		-- A primary key would need to include the partition key: ids are only indexed
+		EXECUTE 'CREATE INDEX ON ' || quote_ident(partitioned_table) || ' (id)';
+		FOREACH definition IN ARRAY coalesce(index_definitions, ARRAY[]::text[])
+		LOOP
+			-- Unique indexes only cover unfinished jobs, which all live in the default
+			-- partition
+			IF starts_with(definition, 'CREATE UNIQUE INDEX') THEN
+				definition := regexp_replace(definition, ' ON (\S+) USING ', ' ON \1_default USING ');
+			END IF;
+			EXECUTE definition;
+		END LOOP;
+		FOREACH definition IN ARRAY coalesce(function_definitions, ARRAY[]::text[])
+		LOOP
+			EXECUTE definition;
+		END LOOP;
+		FOREACH definition IN ARRAY coalesce(trigger_definitions, ARRAY[]::text[])
+		LOOP
+			-- When an update moves a row to another partition, AFTER UPDATE triggers
+			-- don't fire: run them before the update instead
+			IF definition ~ ' FOR EACH ROW ' THEN
+				definition := regexp_replace(definition, ' AFTER UPDATE (OF|ON) ', ' BEFORE UPDATE \1 ');
+			END IF;
+			EXECUTE definition;
+		END LOOP;
+	END LOOP;
+
+	PERFORM procrastinate_create_partitions(now());
+	PERFORM procrastinate_create_partitions(now() + ('1 ' || partition_period)::interval);
+END;
+$$;
@@ -5,52 +5,103 @@
 
 -- defer_job --
 -- Create and enqueue a job
-INSERT INTO procrastinate_jobs (queue_name, task_name, lock, queueing_lock, args, scheduled_at)
-VALUES (%(queue)s, %(task_name)s, %(lock)s, %(queueing_lock)s, %(args)s, %(scheduled_at)s)
+INSERT INTO procrastinate_jobs (queue_name, task_name, lock, queueing_lock, args, scheduled_at, log_events)
+VALUES (%(queue)s, %(task_name)s, %(lock)s, %(queueing_lock)s, %(args)s, %(scheduled_at)s, %(log_events)s)
 RETURNING id;
 
+-- defer_jobs --
+-- Create and enqueue several jobs, skipping those whose queueing lock is taken
+INSERT INTO procrastinate_jobs (queue_name, task_name, lock, queueing_lock, args, scheduled_at, log_events)
+SELECT queue_name, task_name, lock, queueing_lock, args, scheduled_at, log_events
+    FROM unnest(
+        %(queues)s::character varying[],
+        %(task_names)s::character varying[],
+        %(locks)s::text[],
+        %(queueing_locks)s::text[],
+        %(args)s::jsonb[],
+        %(scheduled_ats)s::timestamp with time zone[],
+        %(log_events)s::boolean[]
+    ) WITH ORDINALITY AS job(queue_name, task_name, lock, queueing_lock, args, scheduled_at, log_events, position)
+    ORDER BY position
+ON CONFLICT DO NOTHING
+RETURNING id, queueing_lock;
+
 -- fetch_job --
 -- Get the first awaiting job
 SELECT id, task_name, lock, queueing_lock, args, scheduled_at, queue_name, attempts
     FROM procrastinate_fetch_job(%(queues)s);
 
+-- fetch_jobs --
+-- Get up to nb_jobs awaiting jobs, none of them sharing a lock
+SELECT id, task_name, lock, queueing_lock, args, scheduled_at, queue_name, attempts
+    FROM procrastinate_fetch_jobs(%(queues)s, %(nb_jobs)s)
+    ORDER BY id ASC;
+
 -- select_stalled_jobs --
 -- Get running jobs that started more than a given time ago
-SELECT job.id, task_name, lock, queueing_lock, args, scheduled_at, queue_name, attempts, max(event.at) started_at
+SELECT id, task_name, lock, queueing_lock, args, scheduled_at, queue_name, attempts, started_at
     FROM procrastinate_jobs job
-    JOIN procrastinate_events event
-      ON event.job_id = job.id
-WHERE event.type = 'started'
-  AND job.status = 'doing'
-  AND event.at < NOW() - (%(nb_seconds)s || 'SECOND')::INTERVAL
-  AND (%(queue)s IS NULL OR job.queue_name = %(queue)s)
-  AND (%(task_name)s IS NULL OR job.task_name = %(task_name)s)
-GROUP BY job.id
+WHERE job.status = 'doing'
+  AND job.started_at < NOW() - make_interval(secs => %(nb_seconds)s)
+  AND (%(queue)s::character varying IS NULL OR job.queue_name = %(queue)s)
+  AND (%(task_name)s::character varying IS NULL OR job.task_name = %(task_name)s)
 
 -- delete_old_jobs --
--- Delete jobs that have been in a final state for longer than nb_hours
-DELETE FROM procrastinate_jobs
-WHERE id IN (
-    SELECT job.id FROM (
-        SELECT DISTINCT ON (job.id) job.*, event.at AS latest_at
-            FROM procrastinate_jobs job
-            JOIN procrastinate_events event
-              ON job.id = event.job_id
-            ORDER BY job.id, event.at DESC
-    ) AS job
-    WHERE job.status in %(statuses)s
-      AND (%(queue)s IS NULL OR job.queue_name = %(queue)s)
-      AND latest_at < NOW() - (%(nb_hours)s || 'HOUR')::INTERVAL
+-- Delete at most chunk_size jobs that have been in a final state for longer than nb_hours
+WITH deleted_jobs AS (
+    DELETE FROM procrastinate_jobs
+    WHERE id IN (
+        SELECT job.id FROM procrastinate_jobs job
+        WHERE job.status = ANY(%(statuses)s::procrastinate_job_status[])
+          AND (%(queue)s::character varying IS NULL OR job.queue_name = %(queue)s)
+          AND job.finished_at < NOW() - make_interval(hours => %(nb_hours)s)
+        LIMIT %(chunk_size)s
+    )
+    RETURNING id
 )
+SELECT count(*) AS deleted FROM deleted_jobs;
+
+-- drop_old_partitions --
+-- Drop the partitions of the jobs that have been in a final state for longer than nb_hours
+SELECT procrastinate_drop_partitions(
+    NOW() - make_interval(hours => %(nb_hours)s),
+    %(include_error)s
+);
+
+-- is_partitioned --
+-- Whether the schema was applied with partitioned jobs and events tables
+SELECT to_regclass('procrastinate_partitioning') IS NOT NULL AS partitioned;
 
 -- finish_job --
 -- Stop a job, free the lock and record the relevant events
 SELECT procrastinate_finish_job(%(job_id)s, %(status)s, %(scheduled_at)s);
 
+-- finish_jobs --
+-- Stop several jobs at once, free their locks and record the relevant events
+SELECT procrastinate_finish_jobs(
+    %(job_ids)s,
+    %(statuses)s::procrastinate_job_status[],
+    %(scheduled_ats)s::timestamp with time zone[]
+);
+
 -- listen_queue --
 -- In this one, the argument is an identifier, shoud not be escaped the same way
 LISTEN {channel_name};
 
+-- prepare_statement --
+-- In this one, the arguments are identifiers and SQL, they're not escaped
+PREPARE {statement_name} AS {query};
+
+-- execute_statement --
+-- In this one, the arguments are identifiers and SQL, they're not escaped
+EXECUTE {statement_name}({arguments});
+
+-- prepared_statement_types --
+-- Get the types of the parameters of a prepared statement of the current session
+SELECT parameter_types::text[] AS types
+    FROM pg_prepared_statements
+    WHERE name = %(statement_name)s;
+
 -- check_connection --
 -- This does only check you have read permission
 SELECT TRUE as check;
@@ -70,11 +121,11 @@ SELECT id,
        scheduled_at,
        attempts
   FROM procrastinate_jobs
- WHERE (%(id)s IS NULL OR id = %(id)s)
-   AND (%(queue_name)s IS NULL OR queue_name = %(queue_name)s)
-   AND (%(task_name)s IS NULL OR task_name = %(task_name)s)
-   AND (%(status)s IS NULL OR status = %(status)s)
-   AND (%(lock)s IS NULL OR lock = %(lock)s)
+ WHERE (%(id)s::bigint IS NULL OR id = %(id)s)
+   AND (%(queue_name)s::character varying IS NULL OR queue_name = %(queue_name)s)
+   AND (%(task_name)s::character varying IS NULL OR task_name = %(task_name)s)
+   AND (%(status)s::procrastinate_job_status IS NULL OR status = %(status)s)
+   AND (%(lock)s::text IS NULL OR lock = %(lock)s)
  ORDER BY id ASC;
 
 -- list_queues --
@@ -89,10 +140,10 @@ WITH jobs AS (
           scheduled_at,
           attempts
      FROM procrastinate_jobs
-    WHERE (%(queue_name)s IS NULL OR queue_name = %(queue_name)s)
-      AND (%(task_name)s IS NULL OR task_name = %(task_name)s)
-      AND (%(status)s IS NULL OR status = %(status)s)
-      AND (%(lock)s IS NULL OR lock = %(lock)s)
+    WHERE (%(queue_name)s::character varying IS NULL OR queue_name = %(queue_name)s)
+      AND (%(task_name)s::character varying IS NULL OR task_name = %(task_name)s)
+      AND (%(status)s::procrastinate_job_status IS NULL OR status = %(status)s)
+      AND (%(lock)s::text IS NULL OR lock = %(lock)s)
 )
 SELECT queue_name AS name,
        COUNT(id) AS jobs_count,
@@ -120,10 +171,10 @@ WITH jobs AS (
           scheduled_at,
           attempts
      FROM procrastinate_jobs
-    WHERE (%(queue_name)s IS NULL OR queue_name = %(queue_name)s)
-      AND (%(task_name)s IS NULL OR task_name = %(task_name)s)
-      AND (%(status)s IS NULL OR status = %(status)s)
-      AND (%(lock)s IS NULL OR lock = %(lock)s)
+    WHERE (%(queue_name)s::character varying IS NULL OR queue_name = %(queue_name)s)
+      AND (%(task_name)s::character varying IS NULL OR task_name = %(task_name)s)
+      AND (%(status)s::procrastinate_job_status IS NULL OR status = %(status)s)
+      AND (%(lock)s::text IS NULL OR lock = %(lock)s)
 )
 SELECT task_name AS name,
        COUNT(id) AS jobs_count,
@@ -141,5 +192,9 @@ SELECT task_name AS name,
 
 -- set_job_status --
 UPDATE procrastinate_jobs
-   SET status = %(status)s
+   SET status = %(status)s,
+       finished_at = CASE
+           WHEN %(status)s IN ('succeeded', 'failed') THEN COALESCE(finished_at, NOW())
+           ELSE NULL
+       END
  WHERE id = %(id)s
@@ -29,11 +29,21 @@ CREATE TABLE procrastinate_jobs (
     args jsonb DEFAULT '{}' NOT NULL,
     status procrastinate_job_status DEFAULT 'todo'::procrastinate_job_status NOT NULL,
     scheduled_at timestamp with time zone NULL,
-    attempts integer DEFAULT 0 NOT NULL
+    attempts integer DEFAULT 0 NOT NULL,
+    finished_at timestamp with time zone NULL,
+    deferred_at timestamp with time zone DEFAULT NOW() NULL,
+    started_at timestamp with time zone NULL,
+    log_events boolean DEFAULT true NOT NULL
 );
 
 -- this prevents from having several jobs with the same queueing lock in the "todo" state
 CREATE UNIQUE INDEX procrastinate_jobs_queueing_lock_idx ON procrastinate_jobs (queueing_lock) WHERE status = 'todo';
+-- these indexes only cover the jobs that can be fetched, so that finished jobs don't slow down fetching
+CREATE INDEX procrastinate_jobs_id_todo_idx ON procrastinate_jobs (id) WHERE status = 'todo';
+CREATE INDEX procrastinate_jobs_queue_name_id_todo_idx ON procrastinate_jobs (queue_name, id) WHERE status = 'todo';
+CREATE INDEX procrastinate_jobs_queue_name_scheduled_at_todo_idx ON procrastinate_jobs (queue_name, scheduled_at) WHERE status = 'todo' AND scheduled_at IS NOT NULL;
+CREATE INDEX procrastinate_jobs_id_doing_idx ON procrastinate_jobs (id) WHERE status = 'doing';
+CREATE INDEX procrastinate_jobs_finished_at_idx ON procrastinate_jobs (finished_at) WHERE finished_at IS NOT NULL;
 
 CREATE TABLE procrastinate_events (
     id BIGSERIAL PRIMARY KEY,
@@ -69,7 +79,7 @@ BEGIN
             RETURNING object
 	)
 	UPDATE procrastinate_jobs
-		SET status = 'doing'
+		SET status = 'doing', started_at = now()
 		FROM potential_job, lock_object
         WHERE lock_object.object IS NOT NULL
 		AND procrastinate_jobs.id = potential_job.id
@@ -79,6 +89,39 @@ BEGIN
 END;
 $$;
 
+CREATE FUNCTION procrastinate_fetch_jobs(target_queue_names character varying[], nb_jobs integer) RETURNS SETOF procrastinate_jobs
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+	RETURN QUERY
+	WITH candidate_jobs AS (
+		SELECT procrastinate_jobs.*
+			FROM procrastinate_jobs
+			LEFT JOIN procrastinate_job_locks ON procrastinate_job_locks.object = procrastinate_jobs.lock
+			WHERE (target_queue_names IS NULL OR queue_name = ANY( target_queue_names ))
+			  AND procrastinate_job_locks.object IS NULL
+			  AND status = 'todo'
+			  AND (scheduled_at IS NULL OR scheduled_at <= now())
+			ORDER BY id ASC
+			FOR UPDATE OF procrastinate_jobs SKIP LOCKED LIMIT nb_jobs
+	), potential_jobs AS (
+		-- jobs sharing a lock cannot run together: only keep the oldest one
+		SELECT DISTINCT ON (lock) * FROM candidate_jobs ORDER BY lock, id
+	), lock_objects AS (
+		INSERT INTO procrastinate_job_locks
+			SELECT lock FROM potential_jobs
+			ON CONFLICT DO NOTHING
+			RETURNING object
+	)
+	UPDATE procrastinate_jobs
+		SET status = 'doing', started_at = now()
+		FROM potential_jobs
+		JOIN lock_objects ON lock_objects.object = potential_jobs.lock
+		WHERE procrastinate_jobs.id = potential_jobs.id
+		RETURNING procrastinate_jobs.*;
+END;
+$$;
+
 CREATE FUNCTION procrastinate_finish_job(job_id integer, end_status procrastinate_job_status, next_scheduled_at timestamp with time zone) RETURNS void
     LANGUAGE plpgsql
     AS $$
@@ -87,20 +130,52 @@ BEGIN
 		UPDATE procrastinate_jobs
         SET status = end_status,
             attempts = attempts + 1,
-            scheduled_at = COALESCE(next_scheduled_at, scheduled_at)
+            scheduled_at = COALESCE(next_scheduled_at, scheduled_at),
+            finished_at = CASE
+                WHEN end_status IN ('succeeded', 'failed') THEN now()
+                ELSE NULL
+            END
         WHERE id = job_id RETURNING lock
 	)
 	DELETE FROM procrastinate_job_locks WHERE object = (SELECT lock FROM finished_job);
 END;
 $$;
 
+CREATE FUNCTION procrastinate_finish_jobs(job_ids bigint[], end_statuses procrastinate_job_status[], next_scheduled_ats timestamp with time zone[]) RETURNS void
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+	WITH finished_jobs AS (
+		UPDATE procrastinate_jobs
+		SET status = finished.end_status,
+			attempts = attempts + 1,
+			scheduled_at = COALESCE(finished.next_scheduled_at, scheduled_at),
+			finished_at = CASE
+				WHEN finished.end_status IN ('succeeded', 'failed') THEN now()
+				ELSE NULL
+			END
+		FROM unnest(job_ids, end_statuses, next_scheduled_ats)
+			AS finished(job_id, end_status, next_scheduled_at)
+		WHERE id = finished.job_id RETURNING lock
+	)
+	DELETE FROM procrastinate_job_locks WHERE object IN (SELECT lock FROM finished_jobs);
+END;
+$$;
+
 CREATE FUNCTION procrastinate_notify_queue() RETURNS trigger
     LANGUAGE plpgsql
     AS $$
+DECLARE
+	target_queue_name character varying;
 BEGIN
-	PERFORM pg_notify('procrastinate_queue#' || NEW.queue_name, NEW.task_name);
-	PERFORM pg_notify('procrastinate_any_queue', NEW.task_name);
-	RETURN NEW;
+	FOR target_queue_name IN
+		SELECT DISTINCT queue_name FROM new_jobs
+		WHERE status = 'todo'::procrastinate_job_status
+	LOOP
+		PERFORM pg_notify('procrastinate_queue#' || target_queue_name, target_queue_name);
+		PERFORM pg_notify('procrastinate_any_queue', target_queue_name);
+	END LOOP;
+	RETURN NULL;
 END;
 $$;
 
@@ -164,22 +239,23 @@ CREATE INDEX ON procrastinate_jobs(queue_name);
 
 CREATE TRIGGER procrastinate_jobs_notify_queue
     AFTER INSERT ON procrastinate_jobs
-    FOR EACH ROW WHEN ((new.status = 'todo'::procrastinate_job_status))
+    REFERENCING NEW TABLE AS new_jobs
+    FOR EACH STATEMENT
     EXECUTE PROCEDURE procrastinate_notify_queue();
 
 CREATE TRIGGER procrastinate_trigger_status_events_update
     AFTER UPDATE OF status ON procrastinate_jobs
-    FOR EACH ROW
+    FOR EACH ROW WHEN ((new.log_events))
     EXECUTE PROCEDURE procrastinate_trigger_status_events_procedure_update();
 
 CREATE TRIGGER procrastinate_trigger_status_events_insert
     AFTER INSERT ON procrastinate_jobs
-    FOR EACH ROW WHEN ((new.status = 'todo'::procrastinate_job_status))
+    FOR EACH ROW WHEN ((new.status = 'todo'::procrastinate_job_status AND new.log_events))
     EXECUTE PROCEDURE procrastinate_trigger_status_events_procedure_insert();
 
 CREATE TRIGGER procrastinate_trigger_scheduled_events
     AFTER UPDATE OR INSERT ON procrastinate_jobs
-    FOR EACH ROW WHEN ((new.scheduled_at IS NOT NULL AND new.status = 'todo'::procrastinate_job_status))
+    FOR EACH ROW WHEN ((new.scheduled_at IS NOT NULL AND new.status = 'todo'::procrastinate_job_status AND new.log_events))
     EXECUTE PROCEDURE procrastinate_trigger_scheduled_events_procedure();
 
-CREATE INDEX procrastinate_events_job_id_fkey ON procrastinate_events(job_id);
+CREATE INDEX procrastinate_events_job_id_type_at_idx ON procrastinate_events(job_id, type, at);
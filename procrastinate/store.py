@@ -1,9 +1,12 @@
 import asyncio
 import datetime
-from typing import Iterable, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from procrastinate import connector, exceptions, jobs, sql
 
+# Old jobs are deleted by chunks of this size, each in its own transaction
+DELETE_OLD_JOBS_CHUNK_SIZE = 1000
+
 
 def get_channel_for_queues(queues: Optional[Iterable[str]] = None) -> Iterable[str]:
     if queues is None:
@@ -13,8 +16,18 @@ def get_channel_for_queues(queues: Optional[Iterable[str]] = None) -> Iterable[s
 
 
 class JobStore:
-    def __init__(self, connector: connector.BaseConnector):
+    def __init__(
+        self,
+        connector: connector.BaseConnector,
+        log_events: bool = True,
+        queues_log_events: Optional[Dict[str, bool]] = None,
+    ):
         self.connector = connector
+        self.log_events = log_events
+        self.queues_log_events = queues_log_events or {}
+
+    def should_log_events(self, queue: str) -> bool:
+        return self.queues_log_events.get(queue, self.log_events)
 
     async def defer_job(self, job: jobs.Job) -> int:
         try:
@@ -26,6 +39,7 @@ class JobStore:
                 args=job.task_kwargs,
                 scheduled_at=job.scheduled_at,
                 queue=job.queue,
+                log_events=self.should_log_events(job.queue),
             )
         except exceptions.UniqueViolation as exc:
             if exc.constraint_name == connector.QUEUEING_LOCK_CONSTRAINT:
@@ -37,6 +51,43 @@ class JobStore:
 
         return result["id"]
 
+    async def defer_jobs(
+        self, jobs_to_defer: Iterable[jobs.Job]
+    ) -> List[Optional[int]]:
+        job_list = list(jobs_to_defer)
+        if not job_list:
+            return []
+
+        rows = await self.connector.execute_query_all(
+            query=sql.queries["defer_jobs"],
+            queues=[job.queue for job in job_list],
+            task_names=[job.task_name for job in job_list],
+            locks=[job.lock for job in job_list],
+            queueing_locks=[job.queueing_lock for job in job_list],
+            args=[job.task_kwargs for job in job_list],
+            scheduled_ats=[job.scheduled_at for job in job_list],
+            log_events=[self.should_log_events(job.queue) for job in job_list],
+        )
+
+        # Jobs are inserted in order, so their ids are increasing. A job is only
+        # skipped if its queueing lock is already taken, either by a job in the
+        # database or by a previous job of the same batch.
+        ids = iter(sorted(row["id"] for row in rows))
+        inserted_queueing_locks = {
+            row["queueing_lock"] for row in rows if row["queueing_lock"] is not None
+        }
+        result: List[Optional[int]] = []
+        for job in job_list:
+            if job.queueing_lock is None:
+                result.append(next(ids))
+            elif job.queueing_lock in inserted_queueing_locks:
+                inserted_queueing_locks.remove(job.queueing_lock)
+                result.append(next(ids))
+            else:
+                result.append(None)
+
+        return result
+
     async def fetch_job(self, queues: Optional[Iterable[str]]) -> Optional[jobs.Job]:
 
         row = await self.connector.execute_query_one(
@@ -50,6 +101,16 @@ class JobStore:
 
         return jobs.Job.from_row(row)
 
+    async def fetch_jobs(
+        self, queues: Optional[Iterable[str]], nb_jobs: int
+    ) -> List[jobs.Job]:
+        # Jobs sharing the same lock are never fetched together, so we may get
+        # less than nb_jobs jobs even if there are more waiting
+        rows = await self.connector.execute_query_all(
+            query=sql.queries["fetch_jobs"], queues=queues, nb_jobs=nb_jobs
+        )
+        return [jobs.Job.from_row(row) for row in rows]
+
     async def get_stalled_jobs(
         self,
         nb_seconds: int,
@@ -70,18 +131,37 @@ class JobStore:
         nb_hours: int,
         queue: Optional[str] = None,
         include_error: Optional[bool] = False,
-    ) -> None:
+        chunk_size: int = DELETE_OLD_JOBS_CHUNK_SIZE,
+    ) -> int:
         # We only consider finished jobs by default
         if not include_error:
             statuses = [jobs.Status.SUCCEEDED.value]
         else:
             statuses = [jobs.Status.SUCCEEDED.value, jobs.Status.FAILED.value]
 
+        # Deleting by chunks keeps each transaction (and the locks it holds) short
+        total = 0
+        while True:
+            result = await self.connector.execute_query_one(
+                query=sql.queries["delete_old_jobs"],
+                nb_hours=nb_hours,
+                queue=queue,
+                statuses=statuses,
+                chunk_size=chunk_size,
+            )
+            total += result["deleted"]
+            if result["deleted"] < chunk_size:
+                return total
+
+    async def drop_old_partitions(
+        self, nb_hours: int, include_error: Optional[bool] = False,
+    ) -> None:
+        # Only for the partitioned schema: the partitions of the periods that ended
+        # more than nb_hours ago are dropped as a whole
         await self.connector.execute_query(
-            query=sql.queries["delete_old_jobs"],
+            query=sql.queries["drop_old_partitions"],
             nb_hours=nb_hours,
-            queue=queue,
-            statuses=tuple(statuses),
+            include_error=include_error,
         )
 
     async def finish_job(
@@ -98,6 +178,26 @@ class JobStore:
             scheduled_at=scheduled_at,
         )
 
+    async def finish_jobs(
+        self,
+        finished_jobs: Iterable[
+            Tuple[jobs.Job, jobs.Status, Optional[datetime.datetime]]
+        ],
+    ) -> None:
+        job_ids, statuses, scheduled_ats = [], [], []
+        for job, status, scheduled_at in finished_jobs:
+            assert job.id
+            job_ids.append(job.id)
+            statuses.append(status.value)
+            scheduled_ats.append(scheduled_at)
+
+        await self.connector.execute_query(
+            query=sql.queries["finish_jobs"],
+            job_ids=job_ids,
+            statuses=statuses,
+            scheduled_ats=scheduled_ats,
+        )
+
     async def listen_for_jobs(
         self, *, event: asyncio.Event, queues: Optional[Iterable[str]] = None,
     ) -> None:
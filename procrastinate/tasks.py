@@ -1,7 +1,6 @@
 import datetime
 import logging
-import uuid
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import pendulum
 
@@ -38,7 +37,6 @@ def configure_task(
     if schedule_in is not None:
         schedule_at = pendulum.now("UTC").add(**schedule_in)
 
-    lock = lock or str(uuid.uuid4())
     task_kwargs = task_kwargs or {}
     return jobs.JobDeferrer(
         job=jobs.Job(
@@ -108,6 +106,27 @@ class Task:
 
         return job_id
 
+    async def batch_defer_async(
+        self, *task_kwargs: types.JSONDict
+    ) -> List[Optional[int]]:
+        """
+        Create several jobs from this task at once, one for each dictionary of
+        arguments, using a single database query. As with `Task.defer`, the jobs
+        will be created with default parameters, use `Task.configure` to specify
+        them.
+
+        Jobs that cannot be enqueued because of their queueing lock don't prevent
+        the others to be enqueued.
+
+        Returns
+        -------
+        ``List[Optional[int]]``
+            The ids of the created jobs, in the same order as the arguments. The id
+            is ``None`` when there already was a job in the queue with the same
+            queueing lock.
+        """
+        return await self.configure().batch_defer_async(*task_kwargs)
+
     def configure(
         self,
         *,
@@ -151,7 +170,8 @@ class Task:
         Returns
         -------
         ``jobs.JobDeferrer``
-            An object with a ``defer`` method, identical to `Task.defer`
+            An object with a ``defer`` method, identical to `Task.defer`, and a
+            ``batch_defer`` method, identical to `Task.batch_defer`
 
         Raises
         ------
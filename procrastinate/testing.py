@@ -31,6 +31,11 @@ class InMemoryConnector(connector.BaseConnector):
         self.reset()
         self.reverse_queries = {value: key for key, value in sql.queries.items()}
         self.reverse_queries[schema.SchemaManager.get_schema()] = "apply_schema"
+        for period in schema.PARTITION_PERIODS:
+            partitioned_schema = schema.SchemaManager.get_schema(
+                partition_period=period
+            )
+            self.reverse_queries[partitioned_schema] = "apply_schema"
 
     def reset(self):
         """
@@ -75,11 +80,19 @@ class InMemoryConnector(connector.BaseConnector):
 
     # End of BaseConnector methods
 
+    def add_event(
+        self, job_id: int, type: str, at: Optional[datetime.datetime] = None
+    ) -> None:
+        if self.jobs[job_id]["log_events"]:
+            self.events[job_id].append({"type": type, "at": at or pendulum.now()})
+
     def defer_job_one(
-        self, task_name, lock, queueing_lock, args, scheduled_at, queue
+        self, task_name, lock, queueing_lock, args, scheduled_at, queue, log_events=True
     ) -> JobRow:
-        if any(
-            job for job in self.jobs.values() if job["queueing_lock"] == queueing_lock
+        if queueing_lock is not None and any(
+            job
+            for job in self.jobs.values()
+            if job["queueing_lock"] == queueing_lock and job["status"] == "todo"
         ):
             raise exceptions.UniqueViolation(
                 constraint_name=connector.QUEUEING_LOCK_CONSTRAINT
@@ -97,11 +110,15 @@ class InMemoryConnector(connector.BaseConnector):
             "status": "todo",
             "scheduled_at": scheduled_at,
             "attempts": 0,
+            "finished_at": None,
+            "deferred_at": pendulum.now(),
+            "started_at": None,
+            "log_events": log_events,
         }
         self.events[id] = []
         if scheduled_at:
-            self.events[id].append({"type": "scheduled", "at": scheduled_at})
-        self.events[id].append({"type": "deferred", "at": pendulum.now()})
+            self.add_event(id, "scheduled", at=scheduled_at)
+        self.add_event(id, "deferred")
         if self.notify_event:
             if "procrastinate_any_queue" in self.notify_channels or (
                 f"procrastinate_queue#{queue}" in self.notify_channels
@@ -109,6 +126,37 @@ class InMemoryConnector(connector.BaseConnector):
                 self.notify_event.set()
         return job_row
 
+    def defer_jobs_all(
+        self, queues, task_names, locks, queueing_locks, args, scheduled_ats, log_events
+    ) -> List[JobRow]:
+        rows = []
+        for (
+            queue,
+            task_name,
+            lock,
+            queueing_lock,
+            job_args,
+            scheduled_at,
+            job_log_events,
+        ) in zip(
+            queues, task_names, locks, queueing_locks, args, scheduled_ats, log_events
+        ):
+            try:
+                rows.append(
+                    self.defer_job_one(
+                        task_name=task_name,
+                        lock=lock,
+                        queueing_lock=queueing_lock,
+                        args=job_args,
+                        scheduled_at=scheduled_at,
+                        queue=queue,
+                        log_events=job_log_events,
+                    )
+                )
+            except exceptions.UniqueViolation:
+                pass
+        return rows
+
     @property
     def current_locks(self) -> Iterable[str]:
         return {job["lock"] for job in self.jobs.values() if job["status"] == "doing"}
@@ -135,51 +183,77 @@ class InMemoryConnector(connector.BaseConnector):
                 and job["lock"] not in self.current_locks
             ):
                 job["status"] = "doing"
-                self.events[job["id"]].append({"type": "started", "at": pendulum.now()})
+                job["started_at"] = pendulum.now()
+                self.add_event(job["id"], "started")
 
                 return job
 
         return {"id": None}
 
+    def fetch_jobs_all(
+        self, queues: Optional[Iterable[str]], nb_jobs: int
+    ) -> List[JobRow]:
+        rows = []
+        for _ in range(nb_jobs):
+            row = self.fetch_job_one(queues=queues)
+            if row["id"] is None:
+                break
+            rows.append(row)
+        return rows
+
     def finish_job_run(
         self, job_id: int, status: str, scheduled_at: Optional[datetime.datetime] = None
     ) -> None:
         job_row = self.jobs[job_id]
         job_row["status"] = status
+        job_row["finished_at"] = (
+            pendulum.now() if status in {"failed", "succeeded"} else None
+        )
         event_type = status
 
         if status == "todo":
             job_row["attempts"] += 1
             job_row["scheduled_at"] = scheduled_at
             if scheduled_at:
-                self.events[job_id].append({"type": "scheduled", "at": scheduled_at})
+                self.add_event(job_id, "scheduled", at=scheduled_at)
             event_type = "deferred_for_retry"
 
-        self.events[job_id].append({"type": event_type, "at": pendulum.now()})
+        self.add_event(job_id, event_type)
+
+    def finish_jobs_run(
+        self,
+        job_ids: List[int],
+        statuses: List[str],
+        scheduled_ats: List[Optional[datetime.datetime]],
+    ) -> None:
+        for job_id, status, scheduled_at in zip(job_ids, statuses, scheduled_ats):
+            self.finish_job_run(job_id=job_id, status=status, scheduled_at=scheduled_at)
 
     def select_stalled_jobs_all(self, nb_seconds, queue, task_name):
         return (
             job
             for job in self.jobs.values()
             if job["status"] == "doing"
-            and self.events[job["id"]][-1]["at"]
-            < pendulum.now().subtract(seconds=nb_seconds)
+            and job["started_at"] < pendulum.now().subtract(seconds=nb_seconds)
             and queue in (job["queue_name"], None)
             and task_name in (job["task_name"], None)
         )
 
-    def delete_old_jobs_run(self, nb_hours, queue, statuses):
-        for id, job in list(self.jobs.items()):
+    def delete_old_jobs_one(self, nb_hours, queue, statuses, chunk_size):
+        deleted = 0
+        for id, job in sorted(self.jobs.items()):
+            if deleted >= chunk_size:
+                break
 
             if (
                 job["status"] in statuses
-                and (
-                    max(e["at"] for e in self.events[id])
-                    < pendulum.now().subtract(hours=nb_hours)
-                )
+                and job["finished_at"] < pendulum.now().subtract(hours=nb_hours)
                 and queue in (job["queue_name"], None)
             ):
                 self.jobs.pop(id)
+                deleted += 1
+
+        return {"deleted": deleted}
 
     def listen_for_jobs_run(self) -> None:
         pass
@@ -187,6 +261,9 @@ class InMemoryConnector(connector.BaseConnector):
     def apply_schema_run(self) -> None:
         pass
 
+    def is_partitioned_one(self) -> Dict:
+        return {"partitioned": False}
+
     def list_jobs_all(self, **kwargs):
         for job in self.jobs.values():
             if all(
@@ -213,4 +290,9 @@ class InMemoryConnector(connector.BaseConnector):
 
     def set_job_status_run(self, id, status):
         id = int(id)
-        self.jobs[id]["status"] = status
+        job_row = self.jobs[id]
+        job_row["status"] = status
+        if status not in {"failed", "succeeded"}:
+            job_row["finished_at"] = None
+        elif job_row["finished_at"] is None:
+            job_row["finished_at"] = pendulum.now()
@@ -1,8 +1,10 @@
 import asyncio
+import collections
 import contextlib
+import datetime
 import logging
 import time
-from typing import Dict, Iterable, Optional, Set, Union
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 from procrastinate import app, exceptions, job_context, jobs, signals, tasks
 
@@ -12,6 +14,10 @@ logger = logging.getLogger(__name__)
 WORKER_NAME = "worker"
 WORKER_TIMEOUT = 5.0  # seconds
 WORKER_CONCURRENCY = 1  # parallel task(s)
+WORKER_FINISH_BATCH_SIZE = 1  # job(s) acknowledged at once
+WORKER_FINISH_BATCH_DELAY = 0.01  # seconds
+
+FinishedJob = Tuple[jobs.Job, jobs.Status, Optional[datetime.datetime]]
 
 
 class Worker:
@@ -23,6 +29,8 @@ class Worker:
         concurrency: int = 1,
         wait: bool = True,
         timeout: float = WORKER_TIMEOUT,
+        finish_batch_size: int = WORKER_FINISH_BATCH_SIZE,
+        finish_batch_delay: float = WORKER_FINISH_BATCH_DELAY,
     ):
         self.app = app
         self.queues = queues
@@ -31,6 +39,8 @@ class Worker:
 
         self.timeout = timeout
         self.wait = wait
+        self.finish_batch_size = finish_batch_size
+        self.finish_batch_delay = finish_batch_delay
 
         # Handling the info about the currently running task.
         self.known_missing_tasks: Set[str] = set()
@@ -48,6 +58,15 @@ class Worker:
         self.stop_requested = False
         self.notify_event: Optional[asyncio.Event] = None
 
+        # Jobs fetched from the database but not yet picked by a sub-worker
+        self.prefetched_jobs: Deque[jobs.Job] = collections.deque()
+        self.running_jobs = 0
+        self.fetch_lock: Optional[asyncio.Lock] = None
+
+        # Job completions not yet acknowledged to the database
+        self.finished_jobs: List[FinishedJob] = []
+        self.delayed_flush_task: Optional[asyncio.Future] = None
+
     def context_for_worker(
         self, worker_id: int, reset=False, **kwargs
     ) -> job_context.JobContext:
@@ -92,12 +111,15 @@ class Worker:
         )
 
         with self.listener(), signals.on_stop(self.stop):
-            await asyncio.gather(
-                *(
-                    self.single_worker(worker_id=worker_id)
-                    for worker_id in range(self.concurrency)
+            try:
+                await asyncio.gather(
+                    *(
+                        self.single_worker(worker_id=worker_id)
+                        for worker_id in range(self.concurrency)
+                    )
                 )
-            )
+            finally:
+                await self.flush_finished_jobs()
 
         self.logger.info(
             f"Stopped worker on {self.base_context.queues_display}",
@@ -107,16 +129,48 @@ class Worker:
 
     async def single_worker(self, worker_id: int):
         current_timeout = self.timeout * (worker_id + 1)
-        while not self.stop_requested:
-            job = await self.job_store.fetch_job(self.queues)
+        # Prefetched jobs are already marked as started in the database, so they
+        # need to be processed even if we were asked to stop
+        while not self.stop_requested or self.prefetched_jobs:
+            job = await self.fetch_job()
             if job:
-                await self.process_job(job=job, worker_id=worker_id)
+                try:
+                    await self.process_job(job=job, worker_id=worker_id)
+                finally:
+                    self.running_jobs -= 1
             else:
                 if not self.wait or self.stop_requested:
                     break
                 await self.wait_for_job(timeout=current_timeout)
                 current_timeout = self.timeout * self.concurrency
 
+    async def fetch_job(self) -> Optional[jobs.Job]:
+        """
+        Get the next job for a sub-worker. Jobs are fetched from the database by
+        batches sized to the number of idle sub-workers, and the ones that are not
+        immediately used are kept for the other sub-workers.
+        """
+        if not self.fetch_lock:
+            # Created lazily so that it's bound to the running event loop
+            self.fetch_lock = asyncio.Lock()
+
+        async with self.fetch_lock:
+            if not self.prefetched_jobs and not self.stop_requested:
+                self.prefetched_jobs.extend(
+                    await self.job_store.fetch_jobs(
+                        queues=self.queues, nb_jobs=self.concurrency - self.running_jobs
+                    )
+                )
+                if len(self.prefetched_jobs) > 1 and self.notify_event:
+                    # Wake up the idle sub-workers so that they take the other jobs
+                    self.notify_event.set()
+
+            if not self.prefetched_jobs:
+                return None
+
+            self.running_jobs += 1
+            return self.prefetched_jobs.popleft()
+
     async def wait_for_job(self, timeout: float):
         assert self.notify_event
         self.logger.debug(
@@ -157,7 +211,7 @@ class Worker:
                 extra=context.log_extra(action="task_not_found", exception=str(exc)),
             )
         finally:
-            await self.job_store.finish_job(
+            await self.finish_job(
                 job=job, status=status, scheduled_at=next_attempt_scheduled_at
             )
 
@@ -168,6 +222,61 @@ class Worker:
             # Remove job information from the current context
             self.context_for_worker(worker_id=worker_id, reset=True)
 
+    async def finish_job(
+        self,
+        job: jobs.Job,
+        status: jobs.Status,
+        scheduled_at: Optional[datetime.datetime] = None,
+    ) -> None:
+        """
+        Acknowledge the job completion. If ``finish_batch_size`` is more than 1, the
+        acknowledgement is buffered, and sent along with the others when the buffer
+        is full or after ``finish_batch_delay`` seconds, whichever comes first.
+        """
+        if self.finish_batch_size <= 1:
+            await self.job_store.finish_job(
+                job=job, status=status, scheduled_at=scheduled_at
+            )
+            return
+
+        self.finished_jobs.append((job, status, scheduled_at))
+        if len(self.finished_jobs) >= self.finish_batch_size:
+            await self.flush_finished_jobs()
+        elif not self.delayed_flush_task:
+            self.delayed_flush_task = asyncio.ensure_future(self.delayed_flush())
+
+    async def delayed_flush(self) -> None:
+        await asyncio.sleep(self.finish_batch_delay)
+        self.delayed_flush_task = None
+        try:
+            await self.flush_finished_jobs()
+        except Exception:
+            # Nobody is awaiting this task, so the exception would be lost otherwise
+            self.logger.exception(
+                "Failed to acknowledge job completions",
+                extra=self.base_context.log_extra(action="finish_jobs_error"),
+            )
+
+    async def flush_finished_jobs(self) -> None:
+        """
+        Send all the buffered job completions to the database at once.
+        """
+        if self.delayed_flush_task:
+            self.delayed_flush_task.cancel()
+            self.delayed_flush_task = None
+
+        finished_jobs, self.finished_jobs = self.finished_jobs, []
+        if not finished_jobs:
+            return
+
+        await self.job_store.finish_jobs(finished_jobs)
+        self.logger.debug(
+            f"Acknowledged completion of {len(finished_jobs)} jobs",
+            extra=self.base_context.log_extra(
+                action="finish_jobs", job_ids=[job.id for job, _, _ in finished_jobs]
+            ),
+        )
+
     def load_task(self, task_name: str, worker_id: int) -> tasks.Task:
         if task_name in self.known_missing_tasks:
             raise exceptions.TaskNotFound(f"Cancelling job for {task_name} (not found)")
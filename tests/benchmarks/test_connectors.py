@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+from procrastinate import aiopg_connector, asyncpg_connector, jobs, store
+
+pytestmark = pytest.mark.asyncio
+
+JOBS = 2_000
+
+
+def make_connector(name, connection_params):
+    if name == "aiopg":
+        return aiopg_connector.AiopgConnector(**connection_params)
+    return asyncpg_connector.AsyncpgConnector(database=connection_params["dbname"])
+
+
+async def measure(connector):
+    job_store = store.JobStore(connector=connector)
+    # Opens the pool, so that it isn't part of the measures
+    await connector.execute_query("SELECT 1")
+
+    start = time.perf_counter()
+    for i in range(JOBS):
+        await job_store.defer_job(
+            jobs.Job(
+                queue="queue",
+                task_name="task",
+                lock=str(i),
+                queueing_lock=None,
+                task_kwargs={"a": i, "b": "c" * 100},
+            )
+        )
+    defer_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(JOBS):
+        job = await job_store.fetch_job(queues=None)
+        await job_store.finish_job(job, status=jobs.Status.SUCCEEDED)
+    process_duration = time.perf_counter() - start
+
+    return JOBS / defer_duration, JOBS / process_duration
+
+
+async def test_connectors_throughput(db_factory, setup_db, capsys):
+    results = []
+    for name in ["aiopg", "asyncpg"]:
+        dbname = f"procrastinate_benchmark_{name}"
+        db_factory(dbname=dbname, template=setup_db)
+        connector = make_connector(name, {"dsn": "", "dbname": dbname})
+        try:
+            results.append((name, *await measure(connector)))
+        finally:
+            await connector.close_async()
+
+    with capsys.disabled():
+        print()
+        print(f"{'connector':>10} | defer (jobs/s) | fetch & finish (jobs/s)")
+        for name, defer, process in results:
+            print(f"{name:>10} | {defer:>14.0f} | {process:>23.0f}")
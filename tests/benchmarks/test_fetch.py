@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+from procrastinate import store
+
+pytestmark = pytest.mark.asyncio
+
+# Number of finished jobs in the table when measuring
+HISTORY_SIZES = [0, 10_000, 100_000, 1_000_000]
+TODO_JOBS = 1_000
+FETCHES = 200
+
+
+async def add_history(connector, size):
+    await connector.execute_query(
+        f"""
+        INSERT INTO procrastinate_jobs (queue_name, task_name, lock, args, status)
+        SELECT 'queue_' || mod(i, 4), 'task', 'lock_' || i, '{{}}',
+            (ARRAY['succeeded', 'failed'])[mod(i, 2) + 1]::procrastinate_job_status
+        FROM generate_series(1, {size}) AS i;
+        """
+    )
+
+
+async def add_todo_jobs(connector, size):
+    await connector.execute_query(
+        f"""
+        INSERT INTO procrastinate_jobs (queue_name, task_name, lock, args)
+        SELECT 'queue_' || mod(i, 4), 'task', 'todo_lock_' || i, '{{}}'
+        FROM generate_series(1, {size}) AS i;
+        """
+    )
+
+
+async def test_fetch_latency_against_history_size(pg_connector, capsys):
+    job_store = store.JobStore(connector=pg_connector)
+    results = []
+    current_size = 0
+    for size in HISTORY_SIZES:
+        await add_history(pg_connector, size - current_size)
+        current_size = size
+        await pg_connector.execute_query(
+            "DELETE FROM procrastinate_jobs WHERE status IN ('todo', 'doing');"
+            "DELETE FROM procrastinate_job_locks;"
+        )
+        await add_todo_jobs(pg_connector, TODO_JOBS)
+        await pg_connector.execute_query("ANALYZE procrastinate_jobs;")
+
+        start = time.perf_counter()
+        for _ in range(FETCHES):
+            assert await job_store.fetch_job(queues=["queue_1", "queue_2"])
+        duration = time.perf_counter() - start
+        results.append((size, duration / FETCHES * 1000))
+
+    with capsys.disabled():
+        print()
+        print(f"{'finished jobs':>15} | fetch latency (ms)")
+        for size, latency in results:
+            print(f"{size:>15} | {latency:.3f}")
@@ -206,3 +206,19 @@ async def test_loop_notify_timeout(pg_connector):
             pytest.fail("Failed to detect that connection was closed and stop")
 
     assert not event.is_set()
+
+
+async def test_loop_notify_consume_pending_notifications(pg_connector):
+    event = asyncio.Event()
+    pool = await pg_connector._get_pool()
+    async with pool.acquire() as connection:
+        for payload in ["a", "b", "c"]:
+            await connection.notifies.put(payload)
+        task = asyncio.ensure_future(
+            pg_connector._loop_notify(event=event, connection=connection)
+        )
+        try:
+            await asyncio.wait_for(event.wait(), timeout=1)
+            assert connection.notifies.empty()
+        finally:
+            task.cancel()
@@ -0,0 +1,235 @@
+import asyncio
+import functools
+import json
+
+import attr
+import pendulum
+import pytest
+
+from procrastinate import admin, asyncpg_connector, exceptions, jobs, schema, store
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+async def asyncpg_connector_factory(connection_params):
+    connectors = []
+
+    def _(**kwargs):
+        connector = asyncpg_connector.AsyncpgConnector(
+            **{"database": connection_params["dbname"], **kwargs}
+        )
+        connectors.append(connector)
+        return connector
+
+    yield _
+    for connector in connectors:
+        await connector.close_async()
+
+
+@pytest.fixture
+def apg_connector(asyncpg_connector_factory):
+    return asyncpg_connector_factory()
+
+
+@pytest.mark.parametrize(
+    "method_name, expected",
+    [
+        ("execute_query_one", {"json": {"a": "a", "b": "foo"}}),
+        ("execute_query_all", [{"json": {"a": "a", "b": "foo"}}]),
+    ],
+)
+async def test_execute_query_json_dumps(
+    asyncpg_connector_factory, method_name, expected
+):
+    class NotJSONSerializableByDefault:
+        pass
+
+    def encode(obj):
+        if isinstance(obj, NotJSONSerializableByDefault):
+            return "foo"
+        raise TypeError()
+
+    query = "SELECT %(arg)s::jsonb as json"
+    arg = {"a": "a", "b": NotJSONSerializableByDefault()}
+    json_dumps = functools.partial(json.dumps, default=encode)
+    connector = asyncpg_connector_factory(json_dumps=json_dumps)
+    method = getattr(connector, method_name)
+
+    result = await method(query, arg=arg)
+    assert result == expected
+
+
+async def test_json_loads(asyncpg_connector_factory):
+    @attr.dataclass
+    class Param:
+        p: int
+
+    def decode(dct):
+        if "b" in dct:
+            dct["b"] = Param(p=dct["b"])
+        return dct
+
+    json_loads = functools.partial(json.loads, object_hook=decode)
+
+    query = "SELECT %(arg)s::jsonb as json"
+    arg = {"a": 1, "b": 2}
+    connector = asyncpg_connector_factory(json_loads=json_loads)
+
+    result = await connector.execute_query_one(query, arg=arg)
+    assert result["json"] == {"a": 1, "b": Param(p=2)}
+
+
+async def test_execute_query(apg_connector):
+    assert (
+        await apg_connector.execute_query(
+            "COMMENT ON TABLE \"procrastinate_jobs\" IS 'foo' "
+        )
+        is None
+    )
+    result = await apg_connector.execute_query_one(
+        "SELECT obj_description('public.procrastinate_jobs'::regclass)"
+    )
+    assert result == {"obj_description": "foo"}
+
+    result = await apg_connector.execute_query_all(
+        "SELECT obj_description('public.procrastinate_jobs'::regclass)"
+    )
+    assert result == [{"obj_description": "foo"}]
+
+
+async def test_execute_query_one_no_row(apg_connector):
+    assert await apg_connector.execute_query_one("SELECT 1 WHERE false") is None
+
+
+async def test_execute_query_exception(apg_connector):
+    with pytest.raises(exceptions.ConnectorException):
+        await apg_connector.execute_query("SELECT * FROM unknown_table")
+
+
+async def test_close_async(apg_connector):
+    await apg_connector.execute_query("SELECT 1")
+    pool = apg_connector._pool
+    await apg_connector.close_async()
+    assert pool._closed is True
+    assert apg_connector._pool is None
+
+
+async def test_listen_notify(apg_connector):
+    channel = "somechannel"
+    event = asyncio.Event()
+
+    task = asyncio.ensure_future(
+        apg_connector.listen_notify(channels=[channel], event=event)
+    )
+    try:
+        await event.wait()
+        event.clear()
+        await apg_connector.execute_query(f"""NOTIFY "{channel}" """)
+        await asyncio.wait_for(event.wait(), timeout=1)
+    except asyncio.TimeoutError:
+        pytest.fail("Notify not received within 1 sec")
+    finally:
+        task.cancel()
+
+
+async def test_listen_notify_reconnect(apg_connector):
+    channel = "somechannel"
+    event = asyncio.Event()
+
+    task = asyncio.ensure_future(
+        apg_connector.listen_notify(channels=[channel], event=event)
+    )
+    try:
+        await event.wait()
+        event.clear()
+        # Terminating the listening connection makes the connector listen
+        # again on a new one
+        await apg_connector.execute_query(
+            "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+            "WHERE query LIKE 'LISTEN%%'"
+        )
+        await asyncio.wait_for(event.wait(), timeout=1)
+        event.clear()
+        await apg_connector.execute_query(f"""NOTIFY "{channel}" """)
+        await asyncio.wait_for(event.wait(), timeout=1)
+    except asyncio.TimeoutError:
+        pytest.fail("Notify not received within 1 sec")
+    finally:
+        task.cancel()
+
+
+async def test_apply_schema(asyncpg_connector_factory, db_factory):
+    db_factory(dbname="procrastinate_test_asyncpg")
+    connector = asyncpg_connector_factory(database="procrastinate_test_asyncpg")
+    await schema.SchemaManager(connector=connector).apply_schema_async()
+
+    assert await connector.execute_query_all(
+        "SELECT tablename FROM pg_tables WHERE tablename = 'procrastinate_jobs'"
+    ) == [{"tablename": "procrastinate_jobs"}]
+
+
+async def test_job_lifecycle(apg_connector):
+    # Going through the whole life of jobs runs all the queries of the store
+    job_store = store.JobStore(connector=apg_connector)
+    scheduled_at = pendulum.datetime(2000, 1, 1)
+    assert await job_store.defer_job(
+        jobs.Job(
+            queue="queue_a",
+            task_name="task_1",
+            lock="lock_1",
+            queueing_lock="queueing_lock_1",
+            task_kwargs={"a": "b"},
+            scheduled_at=scheduled_at,
+        )
+    )
+    with pytest.raises(exceptions.AlreadyEnqueued):
+        await job_store.defer_job(
+            jobs.Job(
+                queue="queue_a",
+                task_name="task_1",
+                lock="lock_2",
+                queueing_lock="queueing_lock_1",
+            )
+        )
+    await job_store.defer_jobs(
+        [
+            jobs.Job(
+                queue="queue_b", task_name="task_2", lock=str(i), queueing_lock=None
+            )
+            for i in range(2)
+        ]
+    )
+
+    job = await job_store.fetch_job(queues=["queue_a"])
+    assert job.task_kwargs == {"a": "b"}
+    assert job.scheduled_at == scheduled_at
+    job_1, job_2 = await job_store.fetch_jobs(queues=None, nb_jobs=2)
+
+    assert await job_store.get_stalled_jobs(nb_seconds=0) == [job, job_1, job_2]
+    await job_store.finish_job(job, status=jobs.Status.SUCCEEDED)
+    await job_store.finish_jobs(
+        [(job_1, jobs.Status.FAILED, None), (job_2, jobs.Status.SUCCEEDED, None)]
+    )
+    await apg_connector.execute_query(
+        "UPDATE procrastinate_jobs SET finished_at = finished_at - INTERVAL '2 hours'"
+    )
+
+    job_admin = admin.Admin(connector=apg_connector)
+    assert [row["status"] for row in await job_admin.list_jobs_async()] == [
+        "succeeded",
+        "failed",
+        "succeeded",
+    ]
+    assert await job_admin.list_queues_async(queue="queue_b") == [
+        {
+            "name": "queue_b",
+            "jobs_count": 2,
+            "todo": 0,
+            "doing": 0,
+            "succeeded": 1,
+            "failed": 1,
+        }
+    ]
+
+    assert await job_store.delete_old_jobs(nb_hours=1, include_error=True) == 3
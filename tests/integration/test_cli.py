@@ -32,13 +32,19 @@ def test_worker(entrypoint, click_app, mocker):
     click_app.run_worker = mocker.MagicMock()
     result = entrypoint(
         "--app yay worker --queues a,b --name=w1 --timeout=8.3 "
-        "--one-shot --concurrency=10"
+        "--one-shot --concurrency=10 --finish-batch-size=20 --finish-batch-delay=0.1"
     )
 
     assert result.output.strip() == "Launching a worker on a, b"
     assert result.exit_code == 0
     click_app.run_worker.assert_called_once_with(
-        concurrency=10, name="w1", queues=["a", "b"], timeout=8.3, wait=False,
+        concurrency=10,
+        name="w1",
+        queues=["a", "b"],
+        timeout=8.3,
+        wait=False,
+        finish_batch_size=20,
+        finish_batch_delay=0.1,
     )
 
 
@@ -48,13 +54,30 @@ def test_schema_apply(entrypoint, click_app, mocker):
 
     assert result.output.strip() == "Applying schema\nDone"
     assert result.exit_code == 0
-    apply_schema.assert_called_once_with()
+    apply_schema.assert_called_once_with(partition_period=None)
+
+
+def test_schema_apply_partitioned(entrypoint, click_app, mocker):
+    apply_schema = mocker.patch("procrastinate.schema.SchemaManager.apply_schema")
+    result = entrypoint("-a yay schema --apply --partition-period week")
+
+    assert result.exit_code == 0
+    apply_schema.assert_called_once_with(partition_period="week")
 
 
 def test_schema_read(entrypoint):
     result = entrypoint("schema --read")
 
     assert result.output.startswith("-- Procrastinate Schema")
+    assert "procrastinate_setup_partitioning" not in result.output
+    assert result.exit_code == 0
+
+
+def test_schema_read_partitioned(entrypoint):
+    result = entrypoint("schema --read --partition-period day")
+
+    assert result.output.startswith("-- Procrastinate Schema")
+    assert "SELECT procrastinate_setup_partitioning('day');" in result.output
     assert result.exit_code == 0
 
 
@@ -104,7 +127,7 @@ def test_no_app(entrypoint, mocker):
     assert "Missing app" in result.output
 
 
-def test_defer(entrypoint, click_app, connector):
+def test_defer(entrypoint, click_app, connector, mocker):
     @click_app.task(name="hello")
     def mytask(a):
         pass
@@ -120,6 +143,10 @@ def test_defer(entrypoint, click_app, connector):
         1: {
             "args": {"a": 1},
             "attempts": 0,
+            "finished_at": None,
+            "deferred_at": mocker.ANY,
+            "started_at": None,
+            "log_events": True,
             "id": 1,
             "lock": "sherlock",
             "queueing_lock": "houba",
@@ -164,7 +191,7 @@ def test_defer_queueing_lock_ignore(entrypoint, click_app, connector):
     assert len(connector.jobs) == 1
 
 
-def test_defer_unknown(entrypoint, click_app, connector):
+def test_defer_unknown(entrypoint, click_app, connector, mocker):
     # No space in the json helps entrypoint() to simply split args
     result = entrypoint(
         """-a yay defer --unknown --lock=sherlock --queueing-lock=houba hello {"a":1}"""
@@ -176,6 +203,10 @@ def test_defer_unknown(entrypoint, click_app, connector):
         1: {
             "args": {"a": 1},
             "attempts": 0,
+            "finished_at": None,
+            "deferred_at": mocker.ANY,
+            "started_at": None,
+            "log_events": True,
             "id": 1,
             "lock": "sherlock",
             "queueing_lock": "houba",
@@ -0,0 +1,123 @@
+import pendulum
+import pytest
+
+from procrastinate import aiopg_connector, exceptions, jobs, schema, store
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def partitioned_connection_params(db_factory):
+    dbname = "procrastinate_partitioned_test"
+    db_factory(dbname=dbname)
+
+    connector = aiopg_connector.AiopgConnector(dbname=dbname)
+    schema.SchemaManager(connector=connector).apply_schema(partition_period="day")
+    connector.close()
+
+    return {"dsn": "", "dbname": dbname}
+
+
+@pytest.fixture
+async def partitioned_connector(partitioned_connection_params):
+    connector = aiopg_connector.AiopgConnector(**partitioned_connection_params)
+    yield connector
+    await connector.close_async()
+
+
+@pytest.fixture
+def partitioned_job_store(partitioned_connector):
+    return store.JobStore(connector=partitioned_connector)
+
+
+@pytest.fixture
+def get_rows(partitioned_connector):
+    async def f(query):
+        return await partitioned_connector.execute_query_all(query)
+
+    return f
+
+
+async def finish_jobs(job_store, statuses):
+    await job_store.defer_jobs(
+        [
+            jobs.Job(queue="queue_a", task_name="task", lock=str(i), queueing_lock=None)
+            for i in range(len(statuses))
+        ]
+    )
+    fetched = await job_store.fetch_jobs(queues=None, nb_jobs=len(statuses))
+    await job_store.finish_jobs(
+        [(job, status, None) for job, status in zip(fetched, statuses)]
+    )
+    return fetched
+
+
+async def test_is_partitioned(partitioned_connector, pg_connector):
+    assert await schema.SchemaManager(partitioned_connector).is_partitioned_async()
+    assert not await schema.SchemaManager(pg_connector).is_partitioned_async()
+
+
+async def test_finished_jobs_move_to_partitions(partitioned_job_store, get_rows):
+    statuses = [jobs.Status.SUCCEEDED, jobs.Status.FAILED, jobs.Status.TODO]
+    await finish_jobs(partitioned_job_store, statuses)
+
+    suffix = pendulum.now("UTC").format("YYYYMMDD")
+    rows = await get_rows(
+        "SELECT tableoid::regclass::text AS partition, status "
+        "FROM procrastinate_jobs ORDER BY id"
+    )
+    assert rows == [
+        {"partition": f"procrastinate_jobs_{suffix}_succeeded", "status": "succeeded"},
+        {"partition": f"procrastinate_jobs_{suffix}_failed", "status": "failed"},
+        {"partition": "procrastinate_jobs_default", "status": "todo"},
+    ]
+
+    # Moving jobs to another partition doesn't lose their events
+    rows = await get_rows(
+        "SELECT type FROM procrastinate_events "
+        "WHERE type IN ('succeeded', 'failed', 'deferred_for_retry') ORDER BY job_id"
+    )
+    assert [row["type"] for row in rows] == [
+        "succeeded",
+        "failed",
+        "deferred_for_retry",
+    ]
+
+
+async def test_queueing_lock(partitioned_job_store):
+    job = jobs.Job(queue="queue_a", task_name="task", lock="a", queueing_lock="a")
+    await partitioned_job_store.defer_job(job)
+
+    with pytest.raises(exceptions.AlreadyEnqueued):
+        await partitioned_job_store.defer_job(job)
+
+
+async def test_drop_old_partitions(
+    partitioned_job_store, partitioned_connector, get_rows
+):
+    statuses = [jobs.Status.SUCCEEDED, jobs.Status.FAILED, jobs.Status.TODO]
+    await finish_jobs(partitioned_job_store, statuses)
+    # Pretend the jobs finished 3 days ago: they are moved to the default partition,
+    # until their partition is created
+    await partitioned_connector.execute_query(
+        "UPDATE procrastinate_jobs SET finished_at = finished_at - INTERVAL '3 days' "
+        "WHERE finished_at IS NOT NULL;"
+        "UPDATE procrastinate_events SET at = at - INTERVAL '3 days';"
+        "SELECT procrastinate_create_partitions(NOW() - INTERVAL '3 days');"
+    )
+
+    await partitioned_job_store.drop_old_partitions(nb_hours=24)
+    rows = await get_rows("SELECT status FROM procrastinate_jobs ORDER BY id")
+    assert rows == [{"status": "failed"}, {"status": "todo"}]
+    assert await get_rows("SELECT * FROM procrastinate_events") == []
+
+    await partitioned_job_store.drop_old_partitions(nb_hours=24, include_error=True)
+    rows = await get_rows("SELECT status FROM procrastinate_jobs ORDER BY id")
+    assert rows == [{"status": "todo"}]
+
+    # Partitions exist for the jobs finishing today and tomorrow
+    rows = await get_rows("SELECT suffix FROM procrastinate_partitions ORDER BY suffix")
+    assert [row["suffix"] for row in rows] == [
+        pendulum.now("UTC").format("YYYYMMDD"),
+        pendulum.now("UTC").add(days=1).format("YYYYMMDD"),
+    ]
@@ -1,3 +1,4 @@
+import asyncio
 import datetime
 
 import pendulum
@@ -119,6 +120,28 @@ async def test_get_job_no_result(pg_job_store, job):
     assert await pg_job_store.fetch_job(queues=["queue_a"]) is None
 
 
+async def test_fetch_jobs(pg_job_store):
+    for i, lock in enumerate(["lock_1", "lock_1", "lock_2", "lock_3"]):
+        await pg_job_store.defer_job(
+            jobs.Job(
+                queue="queue_a",
+                task_name="task_1",
+                lock=lock,
+                queueing_lock=None,
+                task_kwargs={"i": i},
+            )
+        )
+
+    fetched = await pg_job_store.fetch_jobs(queues=["queue_a"], nb_jobs=3)
+    # The second job shares the lock of the first one
+    assert [job.task_kwargs for job in fetched] == [{"i": 0}, {"i": 2}]
+
+    fetched = await pg_job_store.fetch_jobs(queues=None, nb_jobs=3)
+    assert [job.task_kwargs for job in fetched] == [{"i": 3}]
+
+    assert await pg_job_store.fetch_jobs(queues=["queue_b"], nb_jobs=3) == []
+
+
 async def test_get_stalled_jobs(get_all, pg_job_store, pg_connector):
     await pg_job_store.defer_job(
         jobs.Job(
@@ -135,11 +158,11 @@ async def test_get_stalled_jobs(get_all, pg_job_store, pg_connector):
     # No started job
     assert await pg_job_store.get_stalled_jobs(nb_seconds=3600) == []
 
-    # We start a job and fake its `started` state in the database
+    # We start a job and back date its start in the database
     job = await pg_job_store.fetch_job(queues=["queue_a"])
     await pg_connector.execute_query(
-        "INSERT INTO procrastinate_events(job_id, type, at) VALUES "
-        "(%(job_id)s, 'started', NOW() - INTERVAL '30 minutes')",
+        "UPDATE procrastinate_jobs SET started_at = NOW() - INTERVAL '30 minutes' "
+        "WHERE id = %(job_id)s",
         job_id=job_id,
     )
 
@@ -179,10 +202,10 @@ async def test_delete_old_jobs_job_is_not_finished(get_all, pg_job_store, pg_con
 
     # We start a job
     job = await pg_job_store.fetch_job(queues=["queue_a"])
-    # We back date the started event
+    # We back date its start
     await pg_connector.execute_query(
-        f"UPDATE procrastinate_events SET at=at - INTERVAL '2 hours'"
-        f"WHERE job_id={job.id}"
+        f"UPDATE procrastinate_jobs SET started_at=started_at - INTERVAL '2 hours'"
+        f"WHERE id={job.id}"
     )
 
     # The job is not finished so it's not deleted
@@ -218,10 +241,10 @@ async def test_delete_old_jobs_multiple_jobs(get_all, pg_job_store, pg_connector
     # We finish both jobs
     await pg_job_store.finish_job(job_a, status=jobs.Status.SUCCEEDED)
     await pg_job_store.finish_job(job_b, status=jobs.Status.SUCCEEDED)
-    # We back date the events for job_a
+    # We back date the end of job_a
     await pg_connector.execute_query(
-        f"UPDATE procrastinate_events SET at=at - INTERVAL '2 hours'"
-        f"WHERE job_id={job_a.id}"
+        f"UPDATE procrastinate_jobs SET finished_at=finished_at - INTERVAL '2 hours'"
+        f"WHERE id={job_a.id}"
     )
 
     # Only job_a is deleted
@@ -299,10 +322,10 @@ async def test_delete_old_jobs_parameters(
     job = await pg_job_store.fetch_job(queues=["queue_a"])
     # We finish the job
     await pg_job_store.finish_job(job, status=status)
-    # We back date its events
+    # We back date its end
     await pg_connector.execute_query(
-        f"UPDATE procrastinate_events SET at=at - INTERVAL '2 hours'"
-        f"WHERE job_id={job.id}"
+        f"UPDATE procrastinate_jobs SET finished_at=finished_at - INTERVAL '2 hours'"
+        f"WHERE id={job.id}"
     )
 
     await pg_job_store.delete_old_jobs(
@@ -335,10 +358,13 @@ async def test_finish_job(get_all, pg_job_store):
     started_at = events_started[0]["at"]
     assert started_at.date() == datetime.datetime.utcnow().date()
     assert await get_all("procrastinate_jobs", "attempts") == [{"attempts": 0}]
+    assert await get_all("procrastinate_jobs", "finished_at") == [{"finished_at": None}]
 
     await pg_job_store.finish_job(job=job, status=jobs.Status.SUCCEEDED)
     expected = [{"status": "succeeded", "attempts": 1}]
     assert await get_all("procrastinate_jobs", "status", "attempts") == expected
+    (row,) = await get_all("procrastinate_jobs", "finished_at")
+    assert row["finished_at"] >= started_at
 
 
 async def test_finish_job_retry(get_all, pg_job_store):
@@ -355,6 +381,8 @@ async def test_finish_job_retry(get_all, pg_job_store):
     job1 = await pg_job_store.fetch_job(queues=None)
     await pg_job_store.finish_job(job=job1, status=jobs.Status.TODO)
 
+    assert await get_all("procrastinate_jobs", "finished_at") == [{"finished_at": None}]
+
     job2 = await pg_job_store.fetch_job(queues=None)
 
     assert job2.id == job1.id
@@ -435,3 +463,123 @@ async def test_defer_job_violate_queueing_lock(pg_job_store):
             excinfo.value.__cause__.diag.constraint_name
             == "procrastinate_jobs_queueing_lock_idx"
         )
+
+
+async def test_defer_jobs(pg_job_store, get_all):
+    await pg_job_store.defer_job(
+        jobs.Job(queue="queue_a", task_name="task_1", lock=None, queueing_lock="a")
+    )
+    ids = await pg_job_store.defer_jobs(
+        [
+            jobs.Job(
+                queue="queue_a",
+                task_name="task_2",
+                lock="lock_1",
+                queueing_lock=None,
+                task_kwargs={"i": 0},
+            ),
+            jobs.Job(
+                queue="queue_a",
+                task_name="task_2",
+                lock="lock_2",
+                queueing_lock="a",
+                task_kwargs={"i": 1},
+            ),
+            jobs.Job(
+                queue="queue_b",
+                task_name="task_2",
+                lock="lock_3",
+                queueing_lock="b",
+                task_kwargs={"i": 2},
+                scheduled_at=pendulum.datetime(2000, 1, 1),
+            ),
+            jobs.Job(
+                queue="queue_a",
+                task_name="task_2",
+                lock="lock_4",
+                queueing_lock="b",
+                task_kwargs={"i": 3},
+            ),
+        ]
+    )
+
+    assert ids[1] is None and ids[3] is None
+    result = await get_all(
+        "procrastinate_jobs", "id", "queue_name", "lock", "args", "scheduled_at"
+    )
+    assert result[1:] == [
+        {
+            "id": ids[0],
+            "queue_name": "queue_a",
+            "lock": "lock_1",
+            "args": {"i": 0},
+            "scheduled_at": None,
+        },
+        {
+            "id": ids[2],
+            "queue_name": "queue_b",
+            "lock": "lock_3",
+            "args": {"i": 2},
+            "scheduled_at": pendulum.datetime(2000, 1, 1),
+        },
+    ]
+
+
+async def test_defer_jobs_notify_once_per_queue(pg_job_store, pg_connector):
+    pool = await pg_connector._get_pool()
+    async with pool.acquire() as connection:
+        async with connection.cursor() as cursor:
+            await cursor.execute('LISTEN "procrastinate_any_queue"')
+            await cursor.execute('LISTEN "procrastinate_queue#queue_a"')
+
+        await pg_job_store.defer_jobs(
+            [
+                jobs.Job(queue=queue, task_name="task", lock=None, queueing_lock=None)
+                for queue in ["queue_a", "queue_b", "queue_a", "queue_a"]
+            ]
+        )
+        await asyncio.sleep(0.1)
+
+        notifies = []
+        while not connection.notifies.empty():
+            notify = connection.notifies.get_nowait()
+            notifies.append((notify.channel, notify.payload))
+
+    assert sorted(notifies) == [
+        ("procrastinate_any_queue", "queue_a"),
+        ("procrastinate_any_queue", "queue_b"),
+        ("procrastinate_queue#queue_a", "queue_a"),
+    ]
+
+
+async def test_delete_old_jobs_chunks(get_all, pg_job_store, pg_connector):
+    await pg_job_store.defer_jobs(
+        [
+            jobs.Job(queue="queue_a", task_name="task", lock=str(i), queueing_lock=None)
+            for i in range(5)
+        ]
+    )
+    for job in await pg_job_store.fetch_jobs(queues=None, nb_jobs=5):
+        await pg_job_store.finish_job(job, status=jobs.Status.SUCCEEDED)
+    await pg_connector.execute_query(
+        "UPDATE procrastinate_jobs SET finished_at=finished_at - INTERVAL '2 hours'"
+    )
+
+    assert await pg_job_store.delete_old_jobs(nb_hours=1, chunk_size=2) == 5
+    assert await get_all("procrastinate_jobs", "id") == []
+
+
+async def test_defer_job_no_log_events(get_all, pg_connector):
+    job_store = store.JobStore(connector=pg_connector, log_events=False)
+    await job_store.defer_job(
+        jobs.Job(queue="queue_a", task_name="task", lock="a", queueing_lock=None)
+    )
+    job = await job_store.fetch_job(queues=None)
+    await job_store.finish_job(job, status=jobs.Status.SUCCEEDED)
+
+    assert await get_all("procrastinate_events", "type") == []
+    (row,) = await get_all(
+        "procrastinate_jobs", "deferred_at", "started_at", "finished_at", "log_events"
+    )
+    assert row["deferred_at"] <= row["started_at"] <= row["finished_at"]
+    assert row["log_events"] is False
@@ -34,11 +34,11 @@ async def test_run(app, running_worker, caplog):
         pytest.fail("Failed to launch task withing .5s")
 
     assert [q[0] for q in app.connector.queries] == [
-        "fetch_job",
+        "fetch_jobs",
         "defer_job",
-        "fetch_job",
+        "fetch_jobs",
         "finish_job",
-        "fetch_job",
+        "fetch_jobs",
     ]
 
     assert [(r.levelname, r.action) for r in caplog.records] == [
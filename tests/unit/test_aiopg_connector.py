@@ -1,4 +1,5 @@
 import psycopg2
+import psycopg2.extras
 import pytest
 
 from procrastinate import aiopg_connector, exceptions
@@ -86,3 +87,20 @@ def test_set_pool_already_set(mocker):
 
     with pytest.raises(exceptions.PoolAlreadySet):
         connector.set_pool(pool)
+
+
+def test_wrap_json():
+    connector = aiopg_connector.AiopgConnector()
+
+    wrapped = connector._wrap_json(
+        {"a": {"b": 1}, "c": [{"d": 2}, None], "e": ["f"], "g": ("h",), "i": 3}
+    )
+
+    assert isinstance(wrapped["a"], psycopg2.extras.Json)
+    assert wrapped["a"].adapted == {"b": 1}
+    assert isinstance(wrapped["c"][0], psycopg2.extras.Json)
+    assert wrapped["c"][0].adapted == {"d": 2}
+    assert wrapped["c"][1] is None
+    assert wrapped["e"] == ["f"]
+    assert wrapped["g"] == ("h",)
+    assert wrapped["i"] == 3
@@ -0,0 +1,124 @@
+import asyncpg
+import pytest
+
+from procrastinate import asyncpg_connector, exceptions
+
+
+class FakeConnection:
+    def __init__(self):
+        self.codecs = {}
+
+    async def set_type_codec(self, typename, **kwargs):
+        self.codecs[typename] = kwargs
+
+
+@pytest.mark.asyncio
+async def test_adapt_pool_args_init():
+    called = []
+
+    async def init(connection):
+        called.append(connection)
+
+    args = asyncpg_connector.AsyncpgConnector._adapt_pool_args(
+        pool_args={"init": init}, json_dumps=None, json_loads=None
+    )
+
+    assert args["init"] is not init
+
+    connection = FakeConnection()
+    await args["init"](connection)
+
+    assert called == [connection]
+    assert set(connection.codecs) == {"jsonb", "json"}
+
+
+@pytest.mark.asyncio
+async def test_adapt_pool_args_json():
+    args = asyncpg_connector.AsyncpgConnector._adapt_pool_args(
+        pool_args={}, json_dumps=lambda value: "dumped", json_loads=lambda value: value
+    )
+
+    connection = FakeConnection()
+    await args["init"](connection)
+
+    jsonb_codec = connection.codecs["jsonb"]
+    assert jsonb_codec["format"] == "binary"
+    assert jsonb_codec["encoder"]({}) == b"\x01dumped"
+    assert jsonb_codec["decoder"](b"\x01loaded") == b"loaded"
+
+
+def test_adapt_pool_args_max_size():
+    args = asyncpg_connector.AsyncpgConnector._adapt_pool_args(
+        pool_args={"max_size": 1}, json_dumps=None, json_loads=None
+    )
+
+    assert args["max_size"] == 2
+
+
+@pytest.mark.asyncio
+async def test_wrap_exceptions_wraps():
+    @asyncpg_connector.wrap_exceptions
+    async def corofunc():
+        raise asyncpg.PostgresError
+
+    coro = corofunc()
+
+    with pytest.raises(exceptions.ConnectorException):
+        await coro
+
+
+@pytest.mark.asyncio
+async def test_wrap_exceptions_unique_violation():
+    @asyncpg_connector.wrap_exceptions
+    async def corofunc():
+        raise asyncpg.exceptions.UniqueViolationError.new(
+            {"C": "23505", "M": "duplicate key", "n": "some_constraint"}
+        )
+
+    with pytest.raises(exceptions.UniqueViolation) as exc_info:
+        await corofunc()
+
+    assert exc_info.value.constraint_name == "some_constraint"
+
+
+@pytest.mark.asyncio
+async def test_wrap_exceptions_success():
+    @asyncpg_connector.wrap_exceptions
+    async def corofunc(a, b):
+        return a, b
+
+    assert await corofunc(1, 2) == (1, 2)
+
+
+@pytest.mark.parametrize(
+    "method_name",
+    [
+        "close_async",
+        "_create_pool",
+        "execute_query",
+        "execute_query_one",
+        "execute_query_all",
+        "listen_notify",
+    ],
+)
+def test_wrap_exceptions_applied(method_name):
+    connector = asyncpg_connector.AsyncpgConnector()
+    assert getattr(connector, method_name)._exceptions_wrapped is True
+
+
+def test_set_pool(mocker):
+    pool = mocker.Mock()
+    connector = asyncpg_connector.AsyncpgConnector()
+
+    connector.set_pool(pool)
+
+    assert connector._pool is pool
+
+
+def test_set_pool_already_set(mocker):
+    pool = mocker.Mock()
+    connector = asyncpg_connector.AsyncpgConnector()
+    connector.set_pool(pool)
+
+    with pytest.raises(exceptions.PoolAlreadySet):
+        connector.set_pool(pool)
@@ -1,6 +1,6 @@
 import pytest
 
-from procrastinate import builtin_tasks, job_context
+from procrastinate import builtin_tasks, job_context, store
 
 pytestmark = pytest.mark.asyncio
 
@@ -13,6 +13,33 @@ async def test_remove_old_jobs(app):
     assert app.connector.queries == [
         (
             "delete_old_jobs",
-            {"nb_hours": 2, "queue": "queue_a", "statuses": ("succeeded", "failed")},
+            {
+                "nb_hours": 2,
+                "queue": "queue_a",
+                "statuses": ["succeeded", "failed"],
+                "chunk_size": store.DELETE_OLD_JOBS_CHUNK_SIZE,
+            },
         )
     ]
+
+
+async def test_remove_old_jobs_partitioned(app):
+    app.connector.is_partitioned_one = lambda: {"partitioned": True}
+    app.connector.drop_old_partitions_run = lambda **kwargs: None
+
+    await builtin_tasks.remove_old_jobs(
+        job_context.JobContext(app=app), max_hours=2, remove_error=True
+    )
+    assert app.connector.queries == [
+        ("is_partitioned", {}),
+        ("drop_old_partitions", {"nb_hours": 2, "include_error": True}),
+    ]
+
+
+async def test_remove_old_jobs_partitioned_queue(app):
+    app.connector.is_partitioned_one = lambda: {"partitioned": True}
+
+    await builtin_tasks.remove_old_jobs(
+        job_context.JobContext(app=app), max_hours=2, queue="queue_a"
+    )
+    assert [query for query, _ in app.connector.queries] == ["delete_old_jobs"]
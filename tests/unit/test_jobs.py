@@ -37,7 +37,7 @@ def test_job_get_context(scheduled_at, context_scheduled_at):
     }
 
 
-def test_job_deferrer_defer(job_store, connector):
+def test_job_deferrer_defer(job_store, connector, mocker):
 
     job = jobs.Job(
         queue="marsupilami",
@@ -55,6 +55,10 @@ def test_job_deferrer_defer(job_store, connector):
         1: {
             "args": {"a": "b", "c": 3},
             "attempts": 0,
+            "finished_at": None,
+            "deferred_at": mocker.ANY,
+            "started_at": None,
+            "log_events": True,
             "id": 1,
             "lock": "sher",
             "queueing_lock": "houba",
@@ -67,7 +71,7 @@ def test_job_deferrer_defer(job_store, connector):
 
 
 @pytest.mark.asyncio
-async def test_job_deferrer_defer_async(job_store, connector):
+async def test_job_deferrer_defer_async(job_store, connector, mocker):
 
     job = jobs.Job(
         queue="marsupilami",
@@ -86,6 +90,10 @@ async def test_job_deferrer_defer_async(job_store, connector):
         1: {
             "args": {"a": "b", "c": 3},
             "attempts": 0,
+            "finished_at": None,
+            "deferred_at": mocker.ANY,
+            "started_at": None,
+            "log_events": True,
             "id": 1,
             "lock": "sher",
             "queueing_lock": "houba",
@@ -97,6 +105,48 @@ async def test_job_deferrer_defer_async(job_store, connector):
     }
 
 
+@pytest.mark.asyncio
+async def test_job_deferrer_batch_defer_async(job_store, connector, caplog):
+    caplog.set_level("DEBUG")
+    job = jobs.Job(
+        queue="marsupilami",
+        lock="sher",
+        queueing_lock=None,
+        task_name="mytask",
+        task_kwargs={"a": "b"},
+    )
+
+    deferrer = jobs.JobDeferrer(job=job, job_store=job_store)
+    ids = await deferrer.batch_defer_async({"c": 3}, {"c": 4})
+
+    assert ids == [1, 2]
+    assert [job["args"] for job in connector.jobs.values()] == [
+        {"a": "b", "c": 3},
+        {"a": "b", "c": 4},
+    ]
+    assert [r.action for r in caplog.records] == ["about_to_defer_jobs", "jobs_defer"]
+
+
+@pytest.mark.asyncio
+async def test_job_deferrer_batch_defer_async_already_enqueued(
+    job_store, connector, caplog
+):
+    caplog.set_level("DEBUG")
+    job = jobs.Job(
+        queue="marsupilami", lock=None, queueing_lock="houba", task_name="mytask",
+    )
+
+    deferrer = jobs.JobDeferrer(job=job, job_store=job_store)
+    ids = await deferrer.batch_defer_async({"c": 3}, {"c": 4})
+
+    assert ids == [1, None]
+    assert [r.action for r in caplog.records] == [
+        "about_to_defer_jobs",
+        "job_already_enqueued",
+        "jobs_defer",
+    ]
+
+
 def test_job_scheduled_at_naive():
     with pytest.raises(ValueError):
         jobs.Job(
@@ -1,10 +1,27 @@
 from collections import defaultdict
 
+import pytest
+
+from procrastinate import schema
+
 
 def test_get_schema(app):
     assert app.schema_manager.get_schema().startswith("-- Procrastinate Schema")
 
 
+def test_get_schema_partitioned(app):
+    queries = app.schema_manager.get_schema(partition_period="week")
+
+    assert queries.startswith("-- Procrastinate Schema")
+    assert "CREATE FUNCTION procrastinate_setup_partitioning(" in queries
+    assert queries.endswith("SELECT procrastinate_setup_partitioning('week');\n")
+
+
+def test_get_schema_partitioned_invalid_period(app):
+    with pytest.raises(ValueError):
+        app.schema_manager.get_schema(partition_period="fortnight")
+
+
 def test_get_migrations_path(app):
     assert app.schema_manager.get_migrations_path().endswith("sql/migrations")
 
@@ -15,3 +32,18 @@ def test_apply_schema(app, connector):
     app.schema_manager.apply_schema()
 
     assert connector.queries == [("apply_schema", {})]
+
+
+def test_apply_schema_partitioned(app, connector):
+    app.schema_manager.apply_schema(partition_period="day")
+
+    assert connector.queries == [("apply_schema", {})]
+
+
+def test_is_partitioned(app, connector):
+    assert app.schema_manager.is_partitioned() is False
+    assert connector.queries == [("is_partitioned", {})]
+
+
+def test_partition_periods():
+    assert schema.PARTITION_PERIODS == ("day", "week")
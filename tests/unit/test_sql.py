@@ -1,3 +1,5 @@
+import pytest
+
 from procrastinate import sql
 
 
@@ -32,3 +34,19 @@ INSERT INTO blou VALUES(%(yay)s)
 
 def test_get_queries():
     assert {"defer_job", "fetch_job", "finish_job"} <= set(sql.get_queries())
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("SELECT 1", ("SELECT 1", ())),
+        ("SELECT %(a)s, %(b)s", ("SELECT $1, $2", ("a", "b"))),
+        (
+            "SELECT %(a)s IS NULL OR b = %(a)s AND c = %(c)s",
+            ("SELECT $1 IS NULL OR b = $1 AND c = $2", ("a", "c")),
+        ),
+        ("SELECT '%%', %(a)s", ("SELECT '%', $1", ("a",))),
+    ],
+)
+def test_convert_query(query, expected):
+    assert sql.convert_query(query) == expected
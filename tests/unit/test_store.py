@@ -1,12 +1,12 @@
 import pendulum
 import pytest
 
-from procrastinate import exceptions, jobs
+from procrastinate import exceptions, jobs, store
 
 pytestmark = pytest.mark.asyncio
 
 
-async def test_store_defer_job(job_store, job_factory, connector):
+async def test_store_defer_job(job_store, job_factory, connector, mocker):
     job_row = await job_store.defer_job(job=job_factory(task_kwargs={"a": "b"}))
 
     assert job_row == 1
@@ -15,6 +15,10 @@ async def test_store_defer_job(job_store, job_factory, connector):
         1: {
             "args": {"a": "b"},
             "attempts": 0,
+            "finished_at": None,
+            "deferred_at": mocker.ANY,
+            "started_at": None,
+            "log_events": True,
             "id": 1,
             "lock": None,
             "queueing_lock": None,
@@ -59,6 +63,51 @@ async def test_store_defer_job_unique_violation_exception_other_constraint(
         await job_store.defer_job(job=job_factory(task_kwargs={"a": "b"}))
 
 
+async def test_store_defer_jobs(job_store, job_factory, connector):
+    ids = await job_store.defer_jobs(
+        [
+            job_factory(task_kwargs={"a": 1}, queueing_lock="a"),
+            job_factory(task_kwargs={"a": 2}),
+            job_factory(task_kwargs={"a": 3}, queueing_lock="a"),
+            job_factory(task_kwargs={"a": 4}, queueing_lock="b"),
+        ]
+    )
+
+    assert ids == [1, 2, None, 3]
+    assert [job["args"] for job in connector.jobs.values()] == [
+        {"a": 1},
+        {"a": 2},
+        {"a": 4},
+    ]
+
+
+@pytest.mark.parametrize(
+    "log_events, queues_log_events, expected",
+    [
+        (True, None, [True, True]),
+        (False, None, [False, False]),
+        (True, {"queue_b": False}, [True, False]),
+        (False, {"queue_b": True}, [False, True]),
+    ],
+)
+async def test_store_defer_jobs_log_events(
+    connector, job_factory, log_events, queues_log_events, expected
+):
+    job_store = store.JobStore(
+        connector=connector, log_events=log_events, queues_log_events=queues_log_events,
+    )
+    await job_store.defer_jobs(
+        [job_factory(queue="queue_a"), job_factory(queue="queue_b")]
+    )
+
+    assert [job["log_events"] for job in connector.jobs.values()] == expected
+
+
+async def test_store_defer_jobs_empty(job_store, connector):
+    assert await job_store.defer_jobs([]) == []
+    assert connector.queries == []
+
+
 async def test_fetch_job_no_suitable_job(job_store):
     assert await job_store.fetch_job(queues=None) is None
 
@@ -69,6 +118,17 @@ async def test_fetch_job(job_store, job_factory):
     assert await job_store.fetch_job(queues=None) == job
 
 
+async def test_fetch_jobs(job_store, job_factory, connector):
+    job_1 = job_factory(id=1, lock="a")
+    job_2 = job_factory(id=2, lock="a")
+    job_3 = job_factory(id=3, lock="b")
+    for job in (job_1, job_2, job_3):
+        await job_store.defer_job(job=job)
+
+    assert await job_store.fetch_jobs(queues=None, nb_jobs=3) == [job_1, job_3]
+    assert connector.queries[-1] == ("fetch_jobs", {"queues": None, "nb_jobs": 3})
+
+
 async def test_get_stalled_jobs_not_stalled(job_store, job_factory):
     job = job_factory(id=1)
     await job_store.defer_job(job=job)
@@ -79,13 +139,13 @@ async def test_get_stalled_jobs_stalled(job_store, job_factory, connector):
     job = job_factory(id=1)
     await job_store.defer_job(job=job)
     await job_store.fetch_job(queues=None)
-    connector.events[1][-1]["at"] = pendulum.datetime(2000, 1, 1)
+    connector.jobs[1]["started_at"] = pendulum.datetime(2000, 1, 1)
     assert await job_store.get_stalled_jobs(nb_seconds=1000) == [job]
 
 
 @pytest.mark.parametrize(
     "include_error, statuses",
-    [(False, ("succeeded",)), (True, ("succeeded", "failed"))],
+    [(False, ["succeeded"]), (True, ["succeeded", "failed"])],
 )
 async def test_delete_old_jobs(
     job_store, job_factory, connector, include_error, statuses, mocker
@@ -97,11 +157,39 @@ async def test_delete_old_jobs(
     assert connector.queries == [
         (
             "delete_old_jobs",
-            {"nb_hours": 5, "queue": "marsupilami", "statuses": statuses},
+            {
+                "nb_hours": 5,
+                "queue": "marsupilami",
+                "statuses": statuses,
+                "chunk_size": store.DELETE_OLD_JOBS_CHUNK_SIZE,
+            },
         )
     ]
 
 
+async def test_drop_old_partitions(job_store, connector):
+    connector.drop_old_partitions_run = lambda **kwargs: None
+
+    await job_store.drop_old_partitions(nb_hours=5, include_error=True)
+    assert connector.queries == [
+        ("drop_old_partitions", {"nb_hours": 5, "include_error": True})
+    ]
+
+
+async def test_delete_old_jobs_chunks(job_store, connector):
+    for i in range(1, 6):
+        connector.jobs[i] = {
+            "id": i,
+            "status": "succeeded",
+            "queue_name": "queue",
+            "finished_at": pendulum.datetime(2000, 1, 1),
+        }
+
+    assert await job_store.delete_old_jobs(nb_hours=5, chunk_size=2) == 5
+    assert connector.jobs == {}
+    assert [query for query, _ in connector.queries] == ["delete_old_jobs"] * 3
+
+
 async def test_finish_job(job_store, job_factory, connector):
     job = job_factory(id=1)
     await job_store.defer_job(job=job)
@@ -114,6 +202,27 @@ async def test_finish_job(job_store, job_factory, connector):
     )
 
 
+async def test_finish_jobs(job_store, job_factory, connector):
+    job_1, job_2 = job_factory(id=1), job_factory(id=2)
+    await job_store.defer_job(job=job_1)
+    await job_store.defer_job(job=job_2)
+    retry_at = pendulum.datetime(2000, 1, 1)
+
+    await job_store.finish_jobs(
+        [(job_1, jobs.Status.SUCCEEDED, None), (job_2, jobs.Status.TODO, retry_at)]
+    )
+    assert connector.queries[-1] == (
+        "finish_jobs",
+        {
+            "job_ids": [1, 2],
+            "statuses": ["succeeded", "todo"],
+            "scheduled_ats": [None, retry_at],
+        },
+    )
+    assert connector.jobs[1]["status"] == "succeeded"
+    assert connector.jobs[2]["status"] == "todo"
+
+
 @pytest.mark.parametrize(
     "queues, channels",
     [
@@ -18,7 +18,7 @@ def test_task_init_with_no_name(app):
 
 
 @pytest.mark.asyncio
-async def test_task_defer_async(app, connector):
+async def test_task_defer_async(app, connector, mocker):
     task = tasks.Task(task_func, app=app, queue="queue")
 
     await task.defer_async(c=3)
@@ -36,10 +36,25 @@ async def test_task_defer_async(app, connector):
             "status": "todo",
             "scheduled_at": None,
             "attempts": 0,
+            "finished_at": None,
+            "deferred_at": mocker.ANY,
+            "started_at": None,
+            "log_events": True,
         }
     }
 
 
+@pytest.mark.asyncio
+async def test_task_batch_defer_async(app, connector):
+    task = tasks.Task(task_func, app=app, queue="queue")
+
+    assert await task.batch_defer_async({"c": 3}, {"c": 4}) == [1, 2]
+
+    assert [job["args"] for job in connector.jobs.values()] == [{"c": 3}, {"c": 4}]
+    # Jobs don't share their lock
+    assert connector.jobs[1]["lock"] != connector.jobs[2]["lock"]
+
+
 def test_configure_task(job_store):
     job = tasks.configure_task(
         name="my_name", job_store=job_store, lock="sher", task_kwargs={"yay": "ho"}
@@ -50,9 +65,13 @@ def test_configure_task(job_store):
 
 
 def test_configure_task_no_lock(job_store):
-    job = tasks.configure_task(name="my_name", job_store=job_store).job
+    deferrer = tasks.configure_task(name="my_name", job_store=job_store)
 
-    assert uuid.UUID(job.lock)
+    assert deferrer.job.lock is None
+    # Each job gets its own lock
+    lock_1, lock_2 = deferrer.make_new_job().lock, deferrer.make_new_job().lock
+    assert uuid.UUID(lock_1) and uuid.UUID(lock_2)
+    assert lock_1 != lock_2
 
 
 def test_configure_task_schedule_at(job_store):
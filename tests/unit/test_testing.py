@@ -55,7 +55,7 @@ def test_make_dynamic_query(connector):
     assert connector.make_dynamic_query("foo {bar}", bar="baz") == "foo baz"
 
 
-def test_defer_job_one(connector):
+def test_defer_job_one(connector, mocker):
     job = connector.defer_job_one(
         task_name="mytask",
         lock="sher",
@@ -76,11 +76,69 @@ def test_defer_job_one(connector):
             "status": "todo",
             "scheduled_at": None,
             "attempts": 0,
+            "finished_at": None,
+            "deferred_at": mocker.ANY,
+            "started_at": None,
+            "log_events": True,
         }
     }
     assert connector.jobs[1] == job
 
 
+def test_defer_job_one_no_log_events(connector):
+    connector.defer_job_one(
+        task_name="mytask",
+        lock="sher",
+        queueing_lock=None,
+        args={},
+        scheduled_at=None,
+        queue="marsupilami",
+        log_events=False,
+    )
+    connector.fetch_job_one(queues=None)
+
+    assert connector.events == {1: []}
+    assert connector.jobs[1]["started_at"] is not None
+
+
+def test_defer_jobs_all(connector):
+    rows = connector.defer_jobs_all(
+        queues=["marsupilami", "marsupilami"],
+        task_names=["mytask", "mytask"],
+        locks=["sher", "sher"],
+        queueing_locks=["houba", "houba"],
+        args=[{"a": "b"}, {"c": "d"}],
+        scheduled_ats=[None, None],
+        log_events=[True, True],
+    )
+
+    assert rows == [connector.jobs[1]]
+    assert list(connector.jobs) == [1]
+
+
+def test_defer_job_one_queueing_lock_only_todo(connector):
+    connector.defer_job_one(
+        task_name="mytask",
+        lock="sher",
+        queueing_lock="houba",
+        args={},
+        scheduled_at=None,
+        queue="marsupilami",
+    )
+    connector.jobs[1]["status"] = "doing"
+
+    connector.defer_job_one(
+        task_name="mytask",
+        lock="sher",
+        queueing_lock="houba",
+        args={},
+        scheduled_at=None,
+        queue="marsupilami",
+    )
+
+    assert list(connector.jobs) == [1, 2]
+
+
 def test_current_locks(connector):
     connector.jobs = {
         1: {"status": "todo", "lock": "foo"},
@@ -104,6 +162,7 @@ def test_select_stalled_jobs_all(connector):
         # We're not selecting this job because it's "succeeded"
         1: {
             "id": 1,
+            "started_at": pendulum.datetime(2000, 1, 1),
             "status": "succeeded",
             "queue_name": "marsupilami",
             "task_name": "mytask",
@@ -111,6 +170,7 @@ def test_select_stalled_jobs_all(connector):
         # This one because it's the wrong queue
         2: {
             "id": 2,
+            "started_at": pendulum.datetime(2000, 1, 1),
             "status": "doing",
             "queue_name": "other_queue",
             "task_name": "mytask",
@@ -118,6 +178,7 @@ def test_select_stalled_jobs_all(connector):
         # This one because of the task
         3: {
             "id": 3,
+            "started_at": pendulum.datetime(2000, 1, 1),
             "status": "doing",
             "queue_name": "marsupilami",
             "task_name": "my_other_task",
@@ -125,6 +186,7 @@ def test_select_stalled_jobs_all(connector):
         # This one because it's not stalled
         4: {
             "id": 4,
+            "started_at": pendulum.datetime(2100, 1, 1),
             "status": "doing",
             "queue_name": "marsupilami",
             "task_name": "mytask",
@@ -132,6 +194,7 @@ def test_select_stalled_jobs_all(connector):
         # We're taking this one.
         5: {
             "id": 5,
+            "started_at": pendulum.datetime(2000, 1, 1),
             "status": "doing",
             "queue_name": "marsupilami",
             "task_name": "mytask",
@@ -139,50 +202,74 @@ def test_select_stalled_jobs_all(connector):
         # And this one
         6: {
             "id": 6,
+            "started_at": pendulum.datetime(2000, 1, 1),
             "status": "doing",
             "queue_name": "marsupilami",
             "task_name": "mytask",
         },
     }
-    connector.events = {
-        1: [{"at": pendulum.datetime(2000, 1, 1)}],
-        2: [{"at": pendulum.datetime(2000, 1, 1)}],
-        3: [{"at": pendulum.datetime(2000, 1, 1)}],
-        4: [{"at": pendulum.datetime(2100, 1, 1)}],
-        5: [{"at": pendulum.datetime(2000, 1, 1)}],
-        6: [{"at": pendulum.datetime(2000, 1, 1)}],
-    }
-
     results = connector.select_stalled_jobs_all(
         queue="marsupilami", task_name="mytask", nb_seconds=0
     )
     assert [job["id"] for job in results] == [5, 6]
 
 
-def test_delete_old_jobs_run(connector):
+def test_delete_old_jobs_one(connector):
+    old = pendulum.datetime(2000, 1, 1)
     connector.jobs = {
         # We're not deleting this job because it's "doing"
-        1: {"id": 1, "status": "doing", "queue_name": "marsupilami"},
+        1: {
+            "id": 1,
+            "status": "doing",
+            "queue_name": "marsupilami",
+            "finished_at": None,
+        },
         # This one because it's the wrong queue
-        2: {"id": 2, "status": "succeeded", "queue_name": "other_queue"},
+        2: {
+            "id": 2,
+            "status": "succeeded",
+            "queue_name": "other_queue",
+            "finished_at": old,
+        },
         # This one is not old enough
-        3: {"id": 3, "status": "succeeded", "queue_name": "marsupilami"},
+        3: {
+            "id": 3,
+            "status": "succeeded",
+            "queue_name": "marsupilami",
+            "finished_at": pendulum.now(),
+        },
         # This one we delete
-        4: {"id": 4, "status": "succeeded", "queue_name": "marsupilami"},
-    }
-    connector.events = {
-        1: [{"type": "succeeded", "at": pendulum.datetime(2000, 1, 1)}],
-        2: [{"type": "succeeded", "at": pendulum.datetime(2000, 1, 1)}],
-        3: [{"type": "succeeded", "at": pendulum.now()}],
-        4: [{"type": "succeeded", "at": pendulum.datetime(2000, 1, 1)}],
+        4: {
+            "id": 4,
+            "status": "succeeded",
+            "queue_name": "marsupilami",
+            "finished_at": old,
+        },
     }
 
-    connector.delete_old_jobs_run(
-        queue="marsupilami", statuses=("succeeded"), nb_hours=0
-    )
+    assert connector.delete_old_jobs_one(
+        queue="marsupilami", statuses=("succeeded"), nb_hours=1, chunk_size=10
+    ) == {"deleted": 1}
     assert 4 not in connector.jobs
 
 
+def test_delete_old_jobs_one_chunk_size(connector):
+    connector.jobs = {
+        i: {
+            "id": i,
+            "status": "succeeded",
+            "queue_name": "marsupilami",
+            "finished_at": pendulum.datetime(2000, 1, 1),
+        }
+        for i in range(1, 4)
+    }
+
+    assert connector.delete_old_jobs_one(
+        queue=None, statuses=("succeeded"), nb_hours=0, chunk_size=2
+    ) == {"deleted": 2}
+    assert list(connector.jobs) == [3]
+
+
 def test_fetch_job_one(connector):
     # This one will be selected, then skipped the second time because it's processing
     connector.defer_job_one(
@@ -235,6 +322,24 @@ def test_fetch_job_one(connector):
     assert connector.fetch_job_one(queues=["marsupilami"])["id"] == 5
 
 
+def test_fetch_jobs_all(connector):
+    for lock in ("a", "a", "b", "c"):
+        connector.defer_job_one(
+            task_name="mytask",
+            args={},
+            queue="marsupilami",
+            scheduled_at=None,
+            lock=lock,
+            queueing_lock=None,
+        )
+
+    rows = connector.fetch_jobs_all(queues=["marsupilami"], nb_jobs=2)
+    assert [row["id"] for row in rows] == [1, 3]
+    # Job 2 still waits for the lock "a" to be released
+    rows = connector.fetch_jobs_all(queues=["marsupilami"], nb_jobs=2)
+    assert [row["id"] for row in rows] == [4]
+
+
 def test_finish_job_run(connector):
     connector.defer_job_one(
         task_name="mytask",
@@ -272,9 +377,27 @@ def test_finish_job_run_retry(connector):
     assert connector.jobs[id]["attempts"] == 1
     assert connector.jobs[id]["status"] == "todo"
     assert connector.jobs[id]["scheduled_at"] == retry_at
+    assert connector.jobs[id]["finished_at"] is None
     assert len(connector.events[id]) == 4
 
 
+def test_finish_job_run_finished_at(connector):
+    connector.defer_job_one(
+        task_name="mytask",
+        args={},
+        queue="marsupilami",
+        scheduled_at=None,
+        lock="sher",
+        queueing_lock="houba",
+    )
+    job_row = connector.fetch_job_one(queues=None)
+    id = job_row["id"]
+
+    connector.finish_job_run(job_id=id, status="succeeded")
+
+    assert connector.jobs[id]["finished_at"] is not None
+
+
 def test_finish_job_run_retry_no_schedule(connector):
     connector.defer_job_one(
         task_name="mytask",
@@ -295,11 +418,38 @@ def test_finish_job_run_retry_no_schedule(connector):
     assert len(connector.events[id]) == 3
 
 
+def test_finish_jobs_run(connector):
+    for lock in ("a", "b"):
+        connector.defer_job_one(
+            task_name="mytask",
+            args={},
+            queue="marsupilami",
+            scheduled_at=None,
+            lock=lock,
+            queueing_lock=None,
+        )
+    connector.fetch_jobs_all(queues=None, nb_jobs=2)
+
+    retry_at = pendulum.datetime(2000, 1, 1)
+    connector.finish_jobs_run(
+        job_ids=[1, 2], statuses=["succeeded", "todo"], scheduled_ats=[None, retry_at]
+    )
+
+    assert connector.jobs[1]["status"] == "succeeded"
+    assert connector.jobs[2]["status"] == "todo"
+    assert connector.jobs[2]["scheduled_at"] == retry_at
+    assert connector.current_locks == set()
+
+
 def test_apply_schema_run(connector):
     # If we don't crash, it's enough
     connector.apply_schema_run()
 
 
+def test_is_partitioned_one(connector):
+    assert connector.is_partitioned_one() == {"partitioned": False}
+
+
 def test_listen_for_jobs_run(connector):
     # If we don't crash, it's enough
     connector.listen_for_jobs_run()
@@ -88,6 +88,87 @@ async def test_process_job_retry_failed_job(
     assert connector.jobs[1]["scheduled_at"] == scheduled_at
 
 
+async def test_finish_job_no_batch(test_worker, job_factory, connector):
+    job = job_factory(id=1)
+    await test_worker.job_store.defer_job(job)
+
+    await test_worker.finish_job(job=job, status=jobs.Status.SUCCEEDED)
+
+    assert connector.queries[-1][0] == "finish_job"
+    assert test_worker.finished_jobs == []
+
+
+async def test_finish_job_batch_size(app, job_factory, connector):
+    test_worker = worker.Worker(app, finish_batch_size=2, finish_batch_delay=1000)
+    job_1, job_2 = job_factory(id=1), job_factory(id=2)
+    await test_worker.job_store.defer_job(job_1)
+    await test_worker.job_store.defer_job(job_2)
+
+    await test_worker.finish_job(job=job_1, status=jobs.Status.SUCCEEDED)
+
+    assert connector.queries[-1][0] == "defer_job"
+    assert test_worker.delayed_flush_task is not None
+    delayed_flush_task = test_worker.delayed_flush_task
+
+    await test_worker.finish_job(job=job_2, status=jobs.Status.FAILED)
+
+    assert connector.queries[-1] == (
+        "finish_jobs",
+        {
+            "job_ids": [1, 2],
+            "statuses": ["succeeded", "failed"],
+            "scheduled_ats": [None, None],
+        },
+    )
+    assert test_worker.finished_jobs == []
+    assert test_worker.delayed_flush_task is None
+    await asyncio.sleep(0)
+    assert delayed_flush_task.cancelled()
+
+
+async def test_finish_job_batch_delay(app, job_factory, connector):
+    test_worker = worker.Worker(app, finish_batch_size=10, finish_batch_delay=0.01)
+    job = job_factory(id=1)
+    await test_worker.job_store.defer_job(job)
+
+    await test_worker.finish_job(job=job, status=jobs.Status.SUCCEEDED)
+    assert connector.jobs[1]["status"] == "todo"
+
+    await asyncio.wait_for(test_worker.delayed_flush_task, timeout=1)
+
+    assert connector.queries[-1][0] == "finish_jobs"
+    assert connector.jobs[1]["status"] == "succeeded"
+
+
+async def test_finish_job_batch_delay_error(app, job_factory, mocker, caplog):
+    test_worker = worker.Worker(app, finish_batch_size=10, finish_batch_delay=0)
+    test_worker.job_store.finish_jobs = mocker.Mock(
+        side_effect=exceptions.ConnectorException
+    )
+
+    await test_worker.finish_job(job=job_factory(id=1), status=jobs.Status.SUCCEEDED)
+    await asyncio.wait_for(test_worker.delayed_flush_task, timeout=1)
+
+    assert [r.action for r in caplog.records] == ["finish_jobs_error"]
+
+
+async def test_run_flushes_finished_jobs(app, connector):
+    test_worker = worker.Worker(
+        app, wait=False, finish_batch_size=10, finish_batch_delay=1000
+    )
+
+    @app.task
+    def task():
+        pass
+
+    await task.defer_async()
+
+    await test_worker.run()
+
+    assert connector.jobs[1]["status"] == "succeeded"
+    assert test_worker.delayed_flush_task is None
+
+
 async def test_run_job(app):
     result = []
 
@@ -434,6 +515,67 @@ async def test_single_worker_spread_wait(app, mocker):
     assert wait_for_job.call_args_list == [mocker.call(4 * (3 + 1)), mocker.call(4 * 7)]
 
 
+async def test_fetch_job_batch(app, mocker):
+    for _ in range(3):
+        await app.configure_task("bla").defer_async()
+
+    test_worker = worker.Worker(app=app, concurrency=2)
+    test_worker.notify_event = mocker.Mock()
+
+    job = await test_worker.fetch_job()
+
+    assert job.id == 1
+    assert [job.id for job in test_worker.prefetched_jobs] == [2]
+    assert test_worker.running_jobs == 1
+    assert app.connector.queries[-1] == ("fetch_jobs", {"queues": None, "nb_jobs": 2})
+    # The other sub-worker is woken up to take the prefetched job
+    test_worker.notify_event.set.assert_called_once_with()
+
+
+async def test_fetch_job_from_buffer(app, job_factory):
+    test_worker = worker.Worker(app=app, concurrency=2)
+    job = job_factory(id=1)
+    test_worker.prefetched_jobs.append(job)
+
+    assert await test_worker.fetch_job() == job
+    assert app.connector.queries == []
+
+
+async def test_fetch_job_only_free_slots(app):
+    test_worker = worker.Worker(app=app, concurrency=5)
+    test_worker.running_jobs = 3
+
+    assert await test_worker.fetch_job() is None
+    assert app.connector.queries == [("fetch_jobs", {"queues": None, "nb_jobs": 2})]
+    assert test_worker.running_jobs == 3
+
+
+async def test_fetch_job_stop_requested(app):
+    await app.configure_task("bla").defer_async()
+    test_worker = worker.Worker(app=app)
+    test_worker.stop_requested = True
+
+    assert await test_worker.fetch_job() is None
+
+
+async def test_single_worker_stop_process_prefetched(app, mocker, job_factory):
+    process_job = mocker.Mock()
+
+    class TestWorker(worker.Worker):
+        async def process_job(self, job, worker_id):
+            process_job(job=job, worker_id=worker_id)
+
+    test_worker = TestWorker(app=app)
+    job = job_factory(id=1)
+    test_worker.prefetched_jobs.append(job)
+    test_worker.stop_requested = True
+
+    await test_worker.single_worker(worker_id=0)
+
+    process_job.assert_called_once_with(job=job, worker_id=0)
+    assert test_worker.running_jobs == 0
+
+
 def test_context_for_worker(app):
     test_worker = worker.Worker(app=app, name="foo")
     expected = job_context.JobContext(app=app, worker_id=3, worker_name="foo")